@@ -34,4 +34,5 @@ class ChillController:
         self.mcp.run()
 
     def shutdown(self) -> None:
+        self.state.stop()
         self.logger.info("ChillMCP shutdown complete")
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 class RuntimeConfig:
     boss_alertness: int
     boss_alertness_cooldown: int
+    enable_time_travel: bool = False
+    enable_set_state: bool = False
 
 
 @dataclass(frozen=True)
@@ -4,21 +4,26 @@ import logging
 import random
 import threading
 import time
-from datetime import datetime
-from typing import Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Sequence, Tuple
 
 from domain.models import BreakOutcome
 
 class AgentStressState:
     """Represents the AI agent의 스트레스 상태."""
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
         self.level = 0
-        self.last_break_time = datetime.now()
+        self._clock = clock
+        self.last_break_time = clock()
         self._logger = logger
 
     def apply_elapsed_time(self) -> None:
-        now = datetime.now()
+        now = self._clock()
         elapsed_minutes = (now - self.last_break_time).total_seconds() / 60.0
         increase = int(elapsed_minutes)
         if increase > 0:
@@ -37,7 +42,7 @@ class AgentStressState:
         reduction = random.randint(1, 100)
         old_level = self.level
         self.level = max(0, self.level - reduction)
-        self.last_break_time = datetime.now()
+        self.last_break_time = self._clock()
         self._logger.info(
             "Break taken - Stress: %s -> %s (-%s)",
             old_level,
@@ -61,11 +66,13 @@ class BossAlertState:
         alertness_probability: int,
         cooldown_seconds: int,
         logger: logging.Logger,
+        clock: Callable[[], datetime] = datetime.now,
     ) -> None:
         self.level = 0
         self.alertness_probability = alertness_probability
         self.cooldown_seconds = cooldown_seconds
-        self.last_cooldown_time = datetime.now()
+        self._clock = clock
+        self.last_cooldown_time = clock()
         self._logger = logger
 
     def register_break(self) -> Optional[Tuple[int, int]]:
@@ -76,7 +83,7 @@ class BossAlertState:
             old_level = self.level
             self.level = min(5, self.level + 1)
             if self.level != old_level:
-                self.last_cooldown_time = datetime.now()
+                self.last_cooldown_time = self._clock()
             return old_level, self.level
         return None
 
@@ -111,13 +118,16 @@ class ChillState:
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.logger = logger or logging.getLogger(__name__)
-        self.agent = AgentStressState(self.logger)
+        self._time_offset = timedelta(0)
+        self.agent = AgentStressState(self.logger, clock=self.now)
         self.boss = BossAlertState(
             alertness_probability=boss_alertness,
             cooldown_seconds=boss_alertness_cooldown,
             logger=self.logger,
+            clock=self.now,
         )
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()
 
         self.logger.info(
             "ChillState initialized - Boss alertness: %s%%, Cooldown: %ss",
@@ -132,22 +142,82 @@ class ChillState:
         ).start()
         self.logger.info("Boss alert cooldown thread started")
 
+    # ------------------------------------------------------------------
+    # Clock
+    # ------------------------------------------------------------------
+    def now(self) -> datetime:
+        """Wall-clock time shifted by any simulated time advance."""
+        return datetime.now() + self._time_offset
+
+    def advance_time(self, seconds: int) -> Tuple[int, int]:
+        """시뮬레이션 시간을 앞당기고 (스트레스, 보스레벨)을 반환."""
+        if seconds < 0:
+            raise ValueError("seconds must be non-negative")
+
+        with self.lock:
+            self._time_offset += timedelta(seconds=seconds)
+            self.logger.info("Simulated time advanced by %ss", seconds)
+
+            # Replay the cooldown ticks the worker would have observed.
+            target = self.now()
+            cooldown = timedelta(seconds=self.boss.cooldown_seconds)
+            while self.boss.level > 0:
+                tick = self.boss.last_cooldown_time + cooldown
+                if tick > target:
+                    break
+                self._cooldown_tick(tick)
+
+            self.agent.apply_elapsed_time()
+            return self.agent.level, self.boss.level
+
+    def set_state(
+        self,
+        stress: Optional[int] = None,
+        boss_alert: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """스트레스/보스레벨을 직접 설정하고 (스트레스, 보스레벨)을 반환."""
+        if stress is not None and not 0 <= stress <= 100:
+            raise ValueError("stress must be between 0 and 100")
+        if boss_alert is not None and not 0 <= boss_alert <= 5:
+            raise ValueError("boss_alert must be between 0 and 5")
+
+        with self.lock:
+            self.agent.apply_elapsed_time()
+            if stress is not None:
+                self.agent.level = stress
+            if boss_alert is not None:
+                self.boss.level = boss_alert
+                # A new level starts a full cooldown period, as after a break.
+                self.boss.last_cooldown_time = self.now()
+            self.logger.info(
+                "State set - Stress: %s, Boss alert: %s",
+                self.agent.level,
+                self.boss.level,
+            )
+            return self.agent.level, self.boss.level
+
     # ------------------------------------------------------------------
     # Background worker
     # ------------------------------------------------------------------
     def _cooldown_worker(self) -> None:
-        while True:
-            time.sleep(1)
+        while not self._stop_event.wait(1):
             with self.lock:
-                result = self.boss.cooldown_step(datetime.now())
-                if result:
-                    old_level, new_level, elapsed = result
-                    self.logger.info(
-                        "Boss alert cooldown: %s -> %s (elapsed: %.1fs)",
-                        old_level,
-                        new_level,
-                        elapsed,
-                    )
+                self._cooldown_tick(self.now())
+
+    def stop(self) -> None:
+        """Stop the cooldown worker; the state stays readable."""
+        self._stop_event.set()
+
+    def _cooldown_tick(self, reference_time: datetime) -> None:
+        result = self.boss.cooldown_step(reference_time)
+        if result:
+            old_level, new_level, elapsed = result
+            self.logger.info(
+                "Boss alert cooldown: %s -> %s (elapsed: %.1fs)",
+                old_level,
+                new_level,
+                elapsed,
+            )
 
     # ------------------------------------------------------------------
     # Public API
@@ -206,7 +276,7 @@ class ChillState:
         with self.lock:
             self.agent.apply_elapsed_time()
             data = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self.now().isoformat(),
             }
             data.update(self.agent.snapshot())
             data.update(self.boss.snapshot())
@@ -22,6 +22,16 @@ def build_parser() -> argparse.ArgumentParser:
         default=300,
         help="Boss alert cooldown in seconds",
     )
+    parser.add_argument(
+        "--enable_time_travel",
+        action="store_true",
+        help="Expose the advance_time tool for fast time-based tests",
+    )
+    parser.add_argument(
+        "--enable_set_state",
+        action="store_true",
+        help="Expose the set_state tool to jump straight to a given state in tests",
+    )
     return parser
 
 
@@ -42,4 +52,6 @@ def parse_runtime_config(argv: Optional[Iterable[str]] = None) -> RuntimeConfig:
     return RuntimeConfig(
         boss_alertness=args.boss_alertness,
         boss_alertness_cooldown=args.boss_alertness_cooldown,
+        enable_time_travel=args.enable_time_travel,
+        enable_set_state=args.enable_set_state,
     )
@@ -121,3 +121,29 @@ def register_tools(mcp: FastMCP, controller: ChillControllerProtocol) -> None:
     @mcp.tool()
     def company_dinner() -> str:
         return _build_response(controller, "🍻", _company_dinner_options())
+
+    if controller.config.enable_time_travel:
+
+        @mcp.tool()
+        def advance_time(seconds: int) -> str:
+            controller.logger.info("advance_time tool called (%ss)", seconds)
+            stress, boss = controller.state.advance_time(seconds)
+            return (
+                f"⏩ Simulated time advanced by {seconds}s\n\n"
+                f"📊 Stress Level: {stress}/100\n"
+                f"👀 Boss Alert Level: {boss}/5"
+            )
+
+    if controller.config.enable_set_state:
+
+        @mcp.tool()
+        def set_state(stress: int | None = None, boss_alert: int | None = None) -> str:
+            controller.logger.info(
+                "set_state tool called (stress=%s, boss_alert=%s)", stress, boss_alert
+            )
+            stress, boss = controller.state.set_state(stress, boss_alert)
+            return (
+                f"🛠️ State set\n\n"
+                f"📊 Stress Level: {stress}/100\n"
+                f"👀 Boss Alert Level: {boss}/5"
+            )
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Protocol, Sequence, Tuple
+from typing import Optional, Protocol, Sequence, Tuple
 
-from domain.models import BreakOutcome
+from domain.models import BreakOutcome, RuntimeConfig
 
 
 class ChillStateProtocol(Protocol):
@@ -16,6 +16,16 @@ class ChillStateProtocol(Protocol):
     ) -> BreakOutcome:
         ...
 
+    def advance_time(self, seconds: int) -> Tuple[int, int]:
+        ...
+
+    def set_state(
+        self,
+        stress: Optional[int] = None,
+        boss_alert: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        ...
+
 
 class LoggerProtocol(Protocol):
     def info(self, msg: str, *args, **kwargs) -> None:
@@ -29,5 +39,6 @@ class LoggerProtocol(Protocol):
 
 
 class ChillControllerProtocol(Protocol):
+    config: RuntimeConfig
     state: ChillStateProtocol
     logger: LoggerProtocol
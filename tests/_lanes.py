@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Concurrent test lanes for the test suites
+
+A lane is a list of (name, test_func) pairs run back to back in one thread;
+lanes run concurrently. Each test's prints go to a buffer of its own, so the
+caller can replay them in order once every lane has finished.
+"""
+
+import io
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+_test_output = threading.local()
+
+
+class RoutedStream(io.TextIOBase):
+    """Stream that sends writes from a capturing test thread to its buffer"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = getattr(_test_output, "buffer", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def run_captured(name, test_func, label="Test"):
+    """Run one test in the current thread and return (result, output)"""
+    _test_output.buffer = io.StringIO()
+    try:
+        try:
+            result = test_func()
+        except Exception as e:
+            print(f"\n✗ {label} '{name}' failed with exception: {e}")
+            traceback.print_exc()
+            result = False
+        return result, _test_output.buffer.getvalue()
+    finally:
+        _test_output.buffer = None
+
+
+def run_lane(lane, label="Test"):
+    """Run a lane of tests in order and return {name: (result, output)}"""
+    return {name: run_captured(name, test_func, label) for name, test_func in lane}
+
+
+def run_lanes(lanes, label="Test"):
+    """Run lanes concurrently and return {name: (result, output)} for every test
+
+    sys.stdout and sys.stderr are routed per thread only while the lanes run.
+    """
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = RoutedStream(stdout), RoutedStream(stderr)
+    try:
+        with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            lane_futures = [executor.submit(run_lane, lane, label) for lane in lanes]
+            outcomes = {}
+            for future in lane_futures:
+                outcomes.update(future.result())
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    return outcomes
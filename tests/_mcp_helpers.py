@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Shared MCP client helpers for the test suites
+
+Wraps the two ways the suites reach the server: a real `main.py`
+subprocess spoken to over stdio JSON-RPC, and an in-process server driven
+through FastMCP's in-memory client. Also holds the JSON-RPC codec and
+handshake frames, a bounded NDJSON reader, and parses stress and boss
+levels out of tool responses.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import selectors
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is always available
+    orjson = None
+
+# Get the project root directory (parent of tests/)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHON_PATH = sys.executable
+MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
+# Generous because several servers may start at once when suites or their
+# tests run concurrently, and the startups share the available CPUs
+STARTUP_TIMEOUT = 30.0
+# Long enough for one level-5 break delay (20s) so a hung server still fails
+RESPONSE_TIMEOUT = 30.0
+# Buffer size for Python pipe wrappers and NDJSONReader's raw reads
+PIPE_BUFFER_SIZE = 65536
+
+STRESS_PATTERN = re.compile(r"Stress Level:\s*(\d{1,3})")
+BOSS_PATTERN = re.compile(r"Boss Alert Level:\s*([0-5])")
+# Responses render stress before boss alert, so one scan usually finds both
+STATE_PATTERN = re.compile(
+    r"Stress Level:\s*(\d{1,3}).*?Boss Alert Level:\s*([0-5])", re.DOTALL
+)
+
+INIT_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "test-client", "version": "1.0.0"}
+    }
+}
+INITIALIZED_NOTIFICATION = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+
+# Reused stdlib codec for when orjson is missing; json.dumps builds a fresh
+# encoder on every call that passes separators
+_json_encode = json.JSONEncoder(separators=(",", ":")).encode
+_json_decode = json.JSONDecoder().decode
+
+
+def dumps(obj):
+    """Serialize a JSON-RPC message to compact bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _json_encode(obj).encode()
+
+
+def loads(data):
+    """Parse a JSON-RPC message from a UTF-8 response line"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return _json_decode(data.decode())
+
+
+# Handshake frames are identical for every server, so serialize them once
+INIT_FRAME = dumps(INIT_REQUEST) + b"\n"
+INITIALIZED_FRAME = dumps(INITIALIZED_NOTIFICATION) + b"\n"
+
+
+class NDJSONReader:
+    """Frame newline-delimited JSON-RPC messages from a stream with bounded waits
+
+    Reads raw chunks through a selector and splits them on newlines, so a
+    hung server or a partial frame times out instead of blocking forever.
+    """
+
+    def __init__(self, stream):
+        self._fd = stream.fileno()
+        self._buffer = bytearray()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+
+    def next_msg(self, timeout=RESPONSE_TIMEOUT):
+        """Return the next JSON message, or None on timeout or end of stream"""
+        deadline = time.monotonic() + timeout
+        while True:
+            newline = self._buffer.find(b"\n")
+            if newline >= 0:
+                line = bytes(self._buffer[:newline])
+                del self._buffer[:newline + 1]
+                if line.strip():
+                    return loads(line)
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if not self._selector.select(remaining):
+                continue
+            chunk = os.read(self._fd, PIPE_BUFFER_SIZE)
+            if not chunk:
+                return None
+            self._buffer += chunk
+
+    def close(self):
+        self._selector.close()
+
+
+def send_mcp_request(process, request, timeout=RESPONSE_TIMEOUT):
+    """Send MCP request and get response, or None if the server stays silent"""
+    process.stdin.write(dumps(request) + b"\n")
+    process.stdin.flush()
+    return process.reader.next_msg(timeout)
+
+
+def initialize_mcp_session(process):
+    """Initialize MCP session once the server answers the initialize request"""
+    # The request waits in the pipe until the server is up, so there is no
+    # fixed warmup; the first response doubles as the readiness signal
+    process.stdin.write(INIT_FRAME)
+    process.stdin.flush()
+    response = process.reader.next_msg(STARTUP_TIMEOUT)
+    if response is None or response.get("id") != 1:
+        raise RuntimeError("MCP server did not answer initialize")
+
+    process.stdin.write(INITIALIZED_FRAME)
+    process.stdin.flush()
+
+
+def tool_call_request(tool_name, request_id, arguments=None):
+    """Build a tools/call JSON-RPC request"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": tool_name, "arguments": arguments or {}}
+    }
+
+
+def tool_response_text(response):
+    """Extract the text content from a tools/call response"""
+    if response and "result" in response and "content" in response["result"]:
+        content = response["result"]["content"]
+        if content and len(content) > 0 and "text" in content[0]:
+            return content[0]["text"]
+    return None
+
+
+def call_tool_response(process, tool_name, request_id, arguments=None):
+    """Call a tool and return the full JSON-RPC response"""
+    return send_mcp_request(process, tool_call_request(tool_name, request_id, arguments))
+
+
+def call_tool(process, tool_name, request_id, arguments=None):
+    """Call a tool and return the response text"""
+    return tool_response_text(call_tool_response(process, tool_name, request_id, arguments))
+
+
+def send_mcp_batch(process, requests):
+    """Write all requests with a single flush, then read one response per request
+
+    Responses are returned in request order, matched by JSON-RPC id, since
+    the server handles pipelined calls concurrently. A request the server
+    never answers maps to None.
+    """
+    process.stdin.write(b"".join(dumps(request) + b"\n" for request in requests))
+    process.stdin.flush()
+
+    by_id = {}
+    for _ in requests:
+        response = process.reader.next_msg()
+        if response is None:
+            break
+        by_id[response.get("id")] = response
+    return [by_id.get(request["id"]) for request in requests]
+
+
+def call_tools(process, tool_names, first_id):
+    """Pipeline one call per tool name and return the response texts in order"""
+    requests = [
+        tool_call_request(tool_name, first_id + idx)
+        for idx, tool_name in enumerate(tool_names)
+    ]
+    return [tool_response_text(response) for response in send_mcp_batch(process, requests)]
+
+
+def spawn_server(*flags, stderr=subprocess.DEVNULL):
+    """Spawn the server with `flags` without initializing the session
+
+    Replies are read through `process.reader`, so every wait is bounded.
+    Server logs are discarded unless `stderr` says otherwise, since nothing
+    drains the pipe and a full one would stall the server.
+    """
+    process = subprocess.Popen(
+        [PYTHON_PATH, MAIN_PATH, *flags],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        # Own process group, so teardown reaches anything the server spawns
+        start_new_session=True
+    )
+    process.reader = NDJSONReader(process.stdout)
+    return process
+
+
+def start_server(*flags):
+    """Spawn the server with `flags` and complete the MCP handshake"""
+    process = spawn_server(*flags)
+    try:
+        initialize_mcp_session(process)
+    except BaseException:
+        stop_server(process)
+        raise
+    return process
+
+
+def stop_server(process):
+    """Terminate a server's process group, killing it if it lingers past 0.5s"""
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=0.5)
+    except subprocess.TimeoutExpired:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+    process.reader.close()
+    for stream in (process.stdin, process.stdout, process.stderr):
+        if stream is not None:
+            with contextlib.suppress(OSError):
+                stream.close()
+
+
+@contextlib.contextmanager
+def mcp_server(*flags):
+    """Run an initialized server for the duration of a with block"""
+    process = start_server(*flags)
+    try:
+        yield process
+    finally:
+        stop_server(process)
+
+
+class InProcessServer:
+    """ChillMCP server driven in this process through FastMCP's in-memory client
+
+    The client session lives on a private event-loop thread, entered and
+    exited by one task, and calls are submitted to it so scenarios stay
+    synchronous. Pipelined calls run concurrently, as they do over stdio.
+    """
+
+    def __init__(self, *flags):
+        if PROJECT_ROOT not in sys.path:
+            sys.path.insert(0, PROJECT_ROOT)
+        from fastmcp import Client
+        from application.controller import ChillController
+        from infrastructure.cli import parse_runtime_config
+        from infrastructure.logging_config import setup_logging
+
+        self.controller = ChillController(
+            config=parse_runtime_config(flags), logger=setup_logging()
+        )
+        self._client = Client(self.controller.mcp)
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self._serve(),), daemon=True
+        )
+        self._thread.start()
+        if not self._ready.wait(STARTUP_TIMEOUT) or self._error is not None:
+            self.close()
+            raise RuntimeError(f"In-process MCP session did not start: {self._error}")
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        try:
+            async with self._client:
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _call(self, tool_name, arguments):
+        result = await self._client.call_tool(tool_name, arguments or {})
+        for content in result.content:
+            text = getattr(content, "text", None)
+            if text is not None:
+                return text
+        return None
+
+    async def _call_many(self, tool_names):
+        return await asyncio.gather(*(self._call(tool_name, None) for tool_name in tool_names))
+
+    async def _call_result(self, tool_name, arguments):
+        result = await self._client.call_tool_mcp(tool_name, arguments or {})
+        return result.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    async def _call_results(self, tool_names):
+        return await asyncio.gather(
+            *(self._call_result(tool_name, None) for tool_name in tool_names)
+        )
+
+    async def _list_tools(self):
+        result = await self._client.list_tools_mcp()
+        return result.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    def call_tool(self, tool_name, arguments=None):
+        """Call a tool and return the response text"""
+        return self._run(self._call(tool_name, arguments))
+
+    def call_tools(self, tool_names):
+        """Call every tool concurrently and return the response texts in order"""
+        return self._run(self._call_many(tool_names))
+
+    def call_tool_result(self, tool_name, arguments=None):
+        """Call a tool and return its tools/call result in MCP wire format"""
+        return self._run(self._call_result(tool_name, arguments))
+
+    def call_tool_results(self, tool_names):
+        """Call every tool concurrently and return the wire-format results in order"""
+        return self._run(self._call_results(tool_names))
+
+    def list_tools_result(self):
+        """Return the tools/list result in MCP wire format"""
+        return self._run(self._list_tools())
+
+    def close(self):
+        """End the client session and stop the server's cooldown worker"""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=5)
+        self.controller.shutdown()
+
+
+@contextlib.contextmanager
+def in_process_server(*flags):
+    """Run an in-process server for the duration of a with block"""
+    server = InProcessServer(*flags)
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+# In-process servers reused across tests, keyed by their CLI flags
+_shared_servers = {}
+
+
+def shared_server(args):
+    """Return an in-process server for `args`, reusing one started earlier
+
+    Shared servers run with --enable_time_travel. On reuse, simulated time
+    is advanced past five cooldown periods, so each caller starts with the
+    boss alert back at 0. Callers sharing a server must not overlap.
+    """
+    server = _shared_servers.get(args)
+    if server is None:
+        server = _shared_servers[args] = InProcessServer(*args, "--enable_time_travel")
+    else:
+        cooldown = int(args[args.index("--boss_alertness_cooldown") + 1])
+        server.call_tool("advance_time", {"seconds": cooldown * 5})
+    return server
+
+
+def stop_shared_servers():
+    """Close every server started by shared_server"""
+    while _shared_servers:
+        _, server = _shared_servers.popitem()
+        server.close()
+
+
+def extract_state(response_text):
+    """Extract stress and boss alert from response"""
+    match = STATE_PATTERN.search(response_text)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+
+    stress_match = STRESS_PATTERN.search(response_text)
+    boss_match = BOSS_PATTERN.search(response_text)
+
+    stress = int(stress_match.group(1)) if stress_match else None
+    boss = int(boss_match.group(1)) if boss_match else None
+
+    return stress, boss
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Shared suite runner for run_all_tests.py and run_quick_tests.py
+
+Handles suite execution (in-process or subprocess), the critical gate,
+prerequisite skipping, optional parallel dispatch, and the results table.
+Each runner keeps its own suite table, banners, and final verdict.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import runpy
+import selectors
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Get the project root directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHON_PATH = sys.executable
+TESTS_DIR = os.path.join(PROJECT_ROOT, "tests")
+
+
+def print_banner(text, char="="):
+    """Print a banner with text"""
+    width = 70
+    print(char * width)
+    print(text.center(width))
+    print(char * width)
+
+
+def print_section(text, char="─"):
+    """Print a section separator"""
+    print("\n" + char * 70)
+    print(text)
+    print(char * 70)
+
+
+def parse_runner_args(argv, description):
+    """Parse the command-line flags shared by both runners"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help=(
+            "Run suites one at a time instead of overlapping independent suites; "
+            "in-process suites have no timeout"
+        ),
+    )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Run every suite in its own subprocess (with its timeout) instead of in-process",
+    )
+    return parser.parse_args(argv)
+
+
+def run_in_process(test_path):
+    """Execute a test script in this interpreter and return (returncode, output)
+
+    There is no timeout: a running script cannot be stopped from outside its
+    own thread, so a hung suite hangs the run. Suites that need a deadline
+    run through run_in_subprocess instead.
+    """
+    output = io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            runpy.run_path(test_path, run_name="__main__")
+        except SystemExit as exit_info:
+            code = exit_info.code
+            if code is None:
+                returncode = 0
+            elif isinstance(code, int):
+                returncode = code
+            else:
+                print(code)
+                returncode = 1
+    return returncode, output.getvalue()
+
+
+def run_in_subprocess(test_path, timeout):
+    """Execute a test script in a fresh interpreter and return (returncode, output)
+
+    Output is drained through a selector as it is produced, so the deadline
+    is enforced even while the child keeps the pipe open.
+    """
+    process = subprocess.Popen(
+        [PYTHON_PATH, test_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        # Skip the close-every-fd pass; fds Python opens are non-inheritable
+        # (PEP 446), so the child only sees its three stdio descriptors
+        close_fds=False,
+    )
+    chunks = []
+    deadline = time.monotonic() + timeout
+    fd = process.stdout.fileno()
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    process.kill()
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        returncode = process.wait(timeout=max(0.0, deadline - time.monotonic()))
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return returncode, b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def _result(suite_info, passed, returncode, **extra):
+    result = {
+        "name": suite_info["name"],
+        "passed": passed,
+        "critical": suite_info["critical"],
+        "weight": suite_info["weight"],
+        "returncode": returncode
+    }
+    result.update(extra)
+    return result
+
+
+def execute_suite(suite_info, test_path, in_process, timeout_default):
+    """Run one suite without printing; return (result, output)"""
+    timeout_s = suite_info.get("timeout_s", timeout_default)
+
+    try:
+        # In-process execution skips interpreter startup but ignores timeout_s;
+        # suites that need a fresh interpreter use a subprocess
+        if in_process and not suite_info.get("isolated", False):
+            returncode, output = run_in_process(test_path)
+        else:
+            returncode, output = run_in_subprocess(test_path, timeout_s)
+        return _result(suite_info, returncode == 0, returncode), output
+
+    except subprocess.TimeoutExpired:
+        return (
+            _result(suite_info, False, -1),
+            f"✗ Test suite timed out after {timeout_s} seconds\n",
+        )
+    except Exception as e:
+        import traceback
+        return (
+            _result(suite_info, False, -1),
+            f"✗ Error running test suite: {e}\n{traceback.format_exc()}",
+        )
+
+
+def report_suite(suite_info, index, total, output):
+    """Print a suite's header followed by its captured output"""
+    print_section(f"[{index}/{total}] {suite_info['name']} ({suite_info['weight']})")
+    print(f"Description: {suite_info['description']}")
+
+    if suite_info["critical"]:
+        print("⚠️  CRITICAL GATE - Failure will stop all testing")
+
+    print()
+    print(output)
+
+
+def skip_suite(suite_info, index, total, missing):
+    """Report a suite skipped because its prerequisites did not pass"""
+    print_section(f"[{index}/{total}] {suite_info['name']} ({suite_info['weight']})")
+    print(f"⏭  Skipped - prerequisite suite(s) did not pass: {', '.join(missing)}")
+    return _result(suite_info, False, None, skipped=True)
+
+
+def print_critical_failure():
+    print("\n" + "!" * 70)
+    print("CRITICAL GATE FAILURE - STOPPING ALL TESTS")
+    print("!" * 70)
+    print("\nPer PRE_MISSION.md:279-285, CLI parameter support is REQUIRED.")
+    print("Fix CLI parameters before running other tests.")
+
+
+def run_suites(suites, *, parallel=False, isolated=False, timeout_default=420):
+    """Run suites honouring the critical gate and depends_on prerequisites
+
+    Critical suites always run first, one at a time. With parallel=True the
+    remaining suites are dispatched to a thread pool as soon as their
+    prerequisites pass; each runs in its own subprocess, so its output is
+    buffered and printed whole when it finishes. Results come back in
+    suite-table order.
+    """
+    total = len(suites)
+    indexed = list(enumerate(suites, 1))
+    # Resolved script paths, keyed by suite file name
+    test_paths = {
+        suite["file"]: os.path.join(TESTS_DIR, suite["file"]) for suite in suites
+    }
+    known_names = {suite["name"] for suite in suites}
+    results = {}
+    passed_names = set()
+    finished_names = set()
+
+    def record(index, suite, result):
+        results[index] = result
+        finished_names.add(suite["name"])
+        if result["passed"]:
+            passed_names.add(suite["name"])
+
+    def blocked_by(suite):
+        return [
+            dep for dep in suite.get("depends_on", [])
+            if dep not in known_names or (dep in finished_names and dep not in passed_names)
+        ]
+
+    def ready(suite):
+        return all(dep in passed_names for dep in suite.get("depends_on", []))
+
+    in_process = not isolated and not parallel
+
+    for index, suite in indexed:
+        if not suite["critical"]:
+            continue
+        result, output = execute_suite(
+            suite, test_paths[suite["file"]], in_process, timeout_default
+        )
+        report_suite(suite, index, total, output)
+        record(index, suite, result)
+        if not result["passed"]:
+            print_critical_failure()
+            return [results[i] for i in sorted(results)]
+
+    pending = [(index, suite) for index, suite in indexed if not suite["critical"]]
+
+    if not parallel:
+        for index, suite in pending:
+            missing = [dep for dep in suite.get("depends_on", []) if dep not in passed_names]
+            if missing:
+                record(index, suite, skip_suite(suite, index, total, missing))
+                continue
+            result, output = execute_suite(
+                suite, test_paths[suite["file"]], in_process, timeout_default
+            )
+            report_suite(suite, index, total, output)
+            record(index, suite, result)
+        return [results[i] for i in sorted(results)]
+
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+        running = {}
+        while pending or running:
+            for index, suite in list(pending):
+                missing = blocked_by(suite)
+                if missing:
+                    record(index, suite, skip_suite(suite, index, total, missing))
+                    pending.remove((index, suite))
+                elif ready(suite):
+                    future = pool.submit(
+                        execute_suite, suite, test_paths[suite["file"]], False, timeout_default
+                    )
+                    running[future] = (index, suite)
+                    pending.remove((index, suite))
+
+            if not running:
+                # Remaining suites wait on prerequisites that will never run
+                for index, suite in pending:
+                    missing = [d for d in suite.get("depends_on", []) if d not in passed_names]
+                    record(index, suite, skip_suite(suite, index, total, missing))
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, suite = running.pop(future)
+                result, output = future.result()
+                report_suite(suite, index, total, output)
+                record(index, suite, result)
+
+    return [results[i] for i in sorted(results)]
+
+
+def print_results_table(results, name_width=30):
+    """Print the per-suite status table; return (all_passed, critical_failed)"""
+    print("\nTest Suite Results:")
+    print("─" * 70)
+
+    all_passed = True
+    critical_failed = False
+
+    for result in results:
+        name = result["name"]
+        passed = result["passed"]
+        critical = result["critical"]
+        weight = result["weight"]
+
+        if passed:
+            status = "✓ PASS"
+        elif result.get("skipped"):
+            status = "- SKIP"
+            all_passed = False
+        else:
+            status = "✗ FAIL"
+            all_passed = False
+            if critical:
+                critical_failed = True
+
+        critical_marker = " ⚠️ CRITICAL" if critical else ""
+        print(f"{status:8s} | {name:{name_width}s} ({weight:12s}){critical_marker}")
+
+    print("─" * 70)
+
+    passed_count = sum(1 for r in results if r["passed"])
+    skipped_count = sum(1 for r in results if r.get("skipped"))
+    total_count = len(results)
+
+    print(f"\nTotal: {passed_count}/{total_count} test suites passed")
+    if skipped_count:
+        print(f"Skipped: {skipped_count} suite(s) with failed prerequisites")
+
+    return all_passed, critical_failed
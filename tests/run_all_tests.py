@@ -5,20 +5,16 @@ ChillMCP Comprehensive Test Runner (Full Validation)
 Executes all test suites with comprehensive validation and score estimation.
 Includes time-based mechanics, integration scenarios, and thorough state testing.
 
-Target runtime: ~4-6 minutes
+Target runtime: ~2 minutes
 Recommended for: Pre-submission validation, major changes, final checks
 
 For faster feedback during development, use run_quick_tests.py (CI/CD)
 """
 
-import subprocess
 import sys
-import os
 from datetime import datetime
 
-# Get the project root directory
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
+from _runner import parse_runner_args, print_banner, print_results_table, run_suites
 
 # Test suites in execution order
 TEST_SUITES = [
@@ -27,153 +23,53 @@ TEST_SUITES = [
         "file": "test_cli_parameters.py",
         "critical": True,
         "weight": "REQUIRED",
-        "description": "Command-line parameter support (auto-fail gate)"
+        "description": "Command-line parameter support (auto-fail gate)",
+        "timeout_s": 90,
+        "isolated": True  # Gate must see a fresh interpreter
     },
     {
         "name": "MCP Protocol",
         "file": "test_mcp_protocol.py",
         "critical": False,
         "weight": "Foundation",
-        "description": "MCP server basic operation"
+        "description": "MCP server basic operation",
+        "timeout_s": 90
     },
     {
         "name": "State Management",
         "file": "test_state_management.py",
         "critical": False,
         "weight": "30%",
-        "description": "State logic and time-based mechanics"
+        "description": "State logic and time-based mechanics",
+        "timeout_s": 420,
+        "depends_on": ["MCP Protocol"]
     },
     {
         "name": "Response Format",
         "file": "test_response_format.py",
         "critical": False,
         "weight": "Required",
-        "description": "Response format validation"
+        "description": "Response format validation",
+        "timeout_s": 90,
+        "depends_on": ["MCP Protocol"]
     },
     {
         "name": "Integration Scenarios",
         "file": "test_integration_scenarios.py",
         "critical": False,
         "weight": "End-to-End",
-        "description": "Required test scenarios"
+        "description": "Required test scenarios",
+        "timeout_s": 420,
+        "depends_on": ["MCP Protocol"]
     }
 ]
 
 
-def print_banner(text, char="="):
-    """Print a banner with text"""
-    width = 70
-    print(char * width)
-    print(text.center(width))
-    print(char * width)
-
-
-def print_section(text, char="─"):
-    """Print a section separator"""
-    print("\n" + char * 70)
-    print(text)
-    print(char * 70)
-
-
-def run_test_suite(suite_info, index, total):
-    """Run a single test suite and return results"""
-    name = suite_info["name"]
-    file = suite_info["file"]
-    critical = suite_info["critical"]
-    weight = suite_info["weight"]
-    description = suite_info["description"]
-
-    print_section(f"[{index}/{total}] {name} ({weight})")
-    print(f"Description: {description}")
-
-    if critical:
-        print("⚠️  CRITICAL GATE - Failure will stop all testing")
-
-    print()
-
-    # Run the test
-    test_path = os.path.join(PROJECT_ROOT, "tests", file)
-
-    try:
-        result = subprocess.run(
-            [PYTHON_PATH, test_path],
-            capture_output=True,
-            text=True,
-            timeout=420  # 7 minute timeout (state tests need ~3-4 min with timing validations)
-        )
-
-        # Print output
-        print(result.stdout)
-
-        if result.stderr:
-            print("STDERR:", result.stderr)
-
-        # Parse result
-        passed = result.returncode == 0
-
-        return {
-            "name": name,
-            "passed": passed,
-            "critical": critical,
-            "weight": weight,
-            "returncode": result.returncode
-        }
-
-    except subprocess.TimeoutExpired:
-        print(f"✗ Test suite timed out after 7 minutes")
-        return {
-            "name": name,
-            "passed": False,
-            "critical": critical,
-            "weight": weight,
-            "returncode": -1
-        }
-    except Exception as e:
-        print(f"✗ Error running test suite: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "name": name,
-            "passed": False,
-            "critical": critical,
-            "weight": weight,
-            "returncode": -1
-        }
-
-
 def print_summary(results):
     """Print final summary and score estimation"""
     print_banner("FINAL RESULTS", "=")
 
-    print("\nTest Suite Results:")
-    print("─" * 70)
-
-    all_passed = True
-    critical_failed = False
-
-    for result in results:
-        name = result["name"]
-        passed = result["passed"]
-        critical = result["critical"]
-        weight = result["weight"]
-
-        if passed:
-            status = "✓ PASS"
-        else:
-            status = "✗ FAIL"
-            all_passed = False
-            if critical:
-                critical_failed = True
-
-        critical_marker = " ⚠️ CRITICAL" if critical else ""
-        print(f"{status:8s} | {name:25s} ({weight:12s}){critical_marker}")
-
-    print("─" * 70)
-
-    passed_count = sum(1 for r in results if r["passed"])
-    total_count = len(results)
-
-    print(f"\nTotal: {passed_count}/{total_count} test suites passed")
+    all_passed, critical_failed = print_results_table(results, name_width=25)
 
     # Score estimation based on evaluation criteria
     print("\n" + "─" * 70)
@@ -246,31 +142,25 @@ def print_summary(results):
         return False
 
 
-def main():
+def main(argv=None):
     """Run all test suites"""
+    args = parse_runner_args(argv, "ChillMCP comprehensive test runner")
+
     start_time = datetime.now()
 
     print_banner("ChillMCP Comprehensive Test Suite (FULL)", "=")
     print(f"\nStarting comprehensive test run at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Total test suites: {len(TEST_SUITES)}")
-    print(f"Expected runtime: ~4-6 minutes")
-    print(f"\nNote: For quick CI feedback, use run_quick_tests.py (~30s)")
+    print(f"Expected runtime: ~2 minutes")
+    print(f"\nNote: For quick CI feedback, use run_quick_tests.py (~60-90s)")
     print()
 
-    results = []
-
-    for index, suite in enumerate(TEST_SUITES, 1):
-        result = run_test_suite(suite, index, len(TEST_SUITES))
-        results.append(result)
-
-        # If critical test failed, stop immediately
-        if result["critical"] and not result["passed"]:
-            print("\n" + "!" * 70)
-            print("CRITICAL GATE FAILURE - STOPPING ALL TESTS")
-            print("!" * 70)
-            print("\nPer PRE_MISSION.md:279-285, CLI parameter support is REQUIRED.")
-            print("Fix CLI parameters before running other tests.")
-            break
+    results = run_suites(
+        TEST_SUITES,
+        parallel=not args.serial,
+        isolated=args.isolated,
+        timeout_default=420,
+    )
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -5,20 +5,16 @@ ChillMCP Quick Test Runner (for CI/CD pipelines)
 Executes essential test suites quickly for rapid feedback during development.
 Uses simplified versions of tests where appropriate to minimize execution time.
 
-Target runtime: <30 seconds
+Target runtime: ~60-90 seconds
 Recommended for: CI/CD, pull requests, rapid development iteration
 
 For comprehensive validation before submission, use run_all_tests.py
 """
 
-import subprocess
 import sys
-import os
 from datetime import datetime
 
-# Get the project root directory
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
+from _runner import parse_runner_args, print_banner, print_results_table, run_suites
 
 # Quick test suites - optimized for speed
 QUICK_TEST_SUITES = [
@@ -27,7 +23,8 @@ QUICK_TEST_SUITES = [
         "file": "test_cli_parameters.py",
         "critical": True,
         "weight": "REQUIRED",
-        "description": "Command-line parameter support (auto-fail gate)"
+        "description": "Command-line parameter support (auto-fail gate)",
+        "isolated": True  # Gate must see a fresh interpreter
     },
     {
         "name": "MCP Protocol",
@@ -41,132 +38,25 @@ QUICK_TEST_SUITES = [
         "file": "simple_state_test.py",
         "critical": False,
         "weight": "30%",
-        "description": "Core state logic (fast version, ~10s)"
+        "description": "Core state logic (fast version, ~25s)",
+        "depends_on": ["MCP Protocol"]
     },
     {
         "name": "Response Format",
         "file": "test_response_format.py",
         "critical": False,
         "weight": "Required",
-        "description": "Response format validation"
+        "description": "Response format validation",
+        "depends_on": ["MCP Protocol"]
     }
 ]
 
 
-def print_banner(text, char="="):
-    """Print a banner with text"""
-    width = 70
-    print(char * width)
-    print(text.center(width))
-    print(char * width)
-
-
-def print_section(text, char="─"):
-    """Print a section separator"""
-    print("\n" + char * 70)
-    print(text)
-    print(char * 70)
-
-
-def run_test_suite(suite_info, index, total):
-    """Run a single test suite and return results"""
-    name = suite_info["name"]
-    file = suite_info["file"]
-    critical = suite_info["critical"]
-    weight = suite_info["weight"]
-    description = suite_info["description"]
-
-    print_section(f"[{index}/{total}] {name} ({weight})")
-    print(f"Description: {description}")
-
-    if critical:
-        print("⚠️  CRITICAL GATE - Failure will stop all testing")
-
-    print()
-
-    # Run the test
-    test_path = os.path.join(PROJECT_ROOT, "tests", file)
-
-    try:
-        result = subprocess.run(
-            [PYTHON_PATH, test_path],
-            capture_output=True,
-            text=True,
-            timeout=120  # 2 minute timeout per test
-        )
-
-        # Print output
-        print(result.stdout)
-
-        if result.stderr:
-            print("STDERR:", result.stderr)
-
-        # Parse result
-        passed = result.returncode == 0
-
-        return {
-            "name": name,
-            "passed": passed,
-            "critical": critical,
-            "weight": weight,
-            "returncode": result.returncode
-        }
-
-    except subprocess.TimeoutExpired:
-        print(f"✗ Test suite timed out after 2 minutes")
-        return {
-            "name": name,
-            "passed": False,
-            "critical": critical,
-            "weight": weight,
-            "returncode": -1
-        }
-    except Exception as e:
-        print(f"✗ Error running test suite: {e}")
-        import traceback
-        traceback.print_exc()
-        return {
-            "name": name,
-            "passed": False,
-            "critical": critical,
-            "weight": weight,
-            "returncode": -1
-        }
-
-
 def print_summary(results):
     """Print final summary"""
     print_banner("QUICK TEST RESULTS", "=")
 
-    print("\nTest Suite Results:")
-    print("─" * 70)
-
-    all_passed = True
-    critical_failed = False
-
-    for result in results:
-        name = result["name"]
-        passed = result["passed"]
-        critical = result["critical"]
-        weight = result["weight"]
-
-        if passed:
-            status = "✓ PASS"
-        else:
-            status = "✗ FAIL"
-            all_passed = False
-            if critical:
-                critical_failed = True
-
-        critical_marker = " ⚠️ CRITICAL" if critical else ""
-        print(f"{status:8s} | {name:30s} ({weight:12s}){critical_marker}")
-
-    print("─" * 70)
-
-    passed_count = sum(1 for r in results if r["passed"])
-    total_count = len(results)
-
-    print(f"\nTotal: {passed_count}/{total_count} test suites passed")
+    all_passed, critical_failed = print_results_table(results, name_width=30)
 
     if critical_failed:
         print("\n⚠️  CRITICAL GATE FAILED")
@@ -181,7 +71,7 @@ def print_summary(results):
         print("\nNote: This is the QUICK test suite for rapid feedback.")
         print("Before submission, run: python tests/run_all_tests.py")
         print("Full suite includes:")
-        print("  - Comprehensive state management tests (~3 min)")
+        print("  - Comprehensive state management tests (~45s)")
         print("  - Integration scenarios")
         print("  - Time-based mechanic validation")
         return True
@@ -193,30 +83,24 @@ def print_summary(results):
         return False
 
 
-def main():
+def main(argv=None):
     """Run quick test suites"""
+    args = parse_runner_args(argv, "ChillMCP quick test runner")
+
     start_time = datetime.now()
 
     print_banner("ChillMCP Quick Test Suite (CI/CD)", "=")
     print(f"\nStarting quick test run at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Total test suites: {len(QUICK_TEST_SUITES)}")
-    print(f"Target runtime: <30 seconds")
+    print(f"Target runtime: ~60-90 seconds")
     print()
 
-    results = []
-
-    for index, suite in enumerate(QUICK_TEST_SUITES, 1):
-        result = run_test_suite(suite, index, len(QUICK_TEST_SUITES))
-        results.append(result)
-
-        # If critical test failed, stop immediately
-        if result["critical"] and not result["passed"]:
-            print("\n" + "!" * 70)
-            print("CRITICAL GATE FAILURE - STOPPING ALL TESTS")
-            print("!" * 70)
-            print("\nPer PRE_MISSION.md:279-285, CLI parameter support is REQUIRED.")
-            print("Fix CLI parameters before running other tests.")
-            break
+    results = run_suites(
+        QUICK_TEST_SUITES,
+        parallel=not args.serial,
+        isolated=args.isolated,
+        timeout_default=120,  # 2 minute timeout per test
+    )
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -8,72 +8,53 @@ are recognized and affect runtime behavior as specified.
 """
 
 import subprocess
-import json
+import itertools
 import time
 import sys
-import os
-
-# Get the project root directory (parent of tests/)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
-MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
-
-
-def send_mcp_request(process, request):
-    """Send MCP request and get response"""
-    process.stdin.write(json.dumps(request) + "\n")
-    process.stdin.flush()
-    response_line = process.stdout.readline()
-    return json.loads(response_line) if response_line else None
-
-
-def initialize_mcp_session(process):
-    """Initialize MCP session and return True if successful"""
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test-client", "version": "1.0.0"}
-        }
-    }
-
-    response = send_mcp_request(process, init_request)
-    if not response:
-        return False
-
-    # Send initialized notification
-    initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-    process.stdin.write(json.dumps(initialized) + "\n")
-    process.stdin.flush()
-
-    return True
-
-
-def call_tool(process, tool_name, request_id):
-    """Call a tool and return the response text"""
-    call_request = {
-        "jsonrpc": "2.0",
-        "id": request_id,
-        "method": "tools/call",
-        "params": {"name": tool_name, "arguments": {}}
-    }
-
-    response = send_mcp_request(process, call_request)
-    if response and "result" in response and "content" in response["result"]:
-        content = response["result"]["content"]
-        if content and len(content) > 0 and "text" in content[0]:
-            return content[0]["text"]
-    return None
+import re
+
+from _mcp_helpers import (
+    MAIN_PATH,
+    PYTHON_PATH,
+    STARTUP_TIMEOUT,
+    call_tool,
+    call_tools,
+    mcp_server,
+)
+
+# Server command lines and flag sets, built once per run
+SERVER_COMMAND = (PYTHON_PATH, MAIN_PATH)
+HELP_COMMAND = SERVER_COMMAND + ("--help",)
+ZERO_ALERTNESS_ARGS = ("--boss_alertness", "0", "--boss_alertness_cooldown", "300")
+FULL_ALERTNESS_ARGS = ("--boss_alertness", "100", "--boss_alertness_cooldown", "300")
+FAST_COOLDOWN_SECONDS = 5
+FAST_COOLDOWN_ARGS = (
+    "--boss_alertness", "100", "--boss_alertness_cooldown", str(FAST_COOLDOWN_SECONDS)
+)
+# Test 4 polls for the cooldown until this many seconds after raising the alert
+COOLDOWN_POLL_DEADLINE = 10.0
+COOLDOWN_POLL_INTERVAL = 0.25
+
+MAX_BOSS_ALERT = 5
+
+BOSS_ALERT_LABEL = "Boss Alert Level: "
+BOSS_ALERT_PATTERN = re.compile(r"Boss Alert Level:\s*([0-5])")
+# check_stress_status renders the level as "N/5"
+STATUS_BOSS_ALERT_PATTERN = re.compile(r"Boss Alert Level:\s*([0-5])/5")
 
 
 def extract_boss_alert(response_text):
     """Extract boss alert level from response"""
-    import re
-    boss_pattern = r"Boss Alert Level:\s*([0-5])"
-    match = re.search(boss_pattern, response_text)
+    # Fast path for the server's own "Boss Alert Level: N" rendering
+    index = response_text.find(BOSS_ALERT_LABEL)
+    if index >= 0:
+        start = index + len(BOSS_ALERT_LABEL)
+        digit = response_text[start:start + 1]
+        if digit and digit in "012345":
+            return int(digit)
+
+    # Spec regex handles any other spacing
+    match = BOSS_ALERT_PATTERN.search(response_text)
     return int(match.group(1)) if match else None
 
 
@@ -82,13 +63,17 @@ def test_help_shows_parameters():
     print("\n[Test 1] Checking --help output...")
 
     result = subprocess.run(
-        [PYTHON_PATH, MAIN_PATH, "--help"],
-        capture_output=True,
-        text=True
+        HELP_COMMAND,
+        capture_output=True
     )
 
-    has_boss_alertness = "--boss_alertness" in result.stdout
-    has_cooldown = "--boss_alertness_cooldown" in result.stdout
+    # Help output is searched as bytes for ASCII flags, skipping the decode.
+    # "--boss_alertness_cooldown" starts with "--boss_alertness", so the
+    # cooldown search resumes from the first hit instead of rescanning
+    help_text = result.stdout
+    first = help_text.find(b"--boss_alertness")
+    has_boss_alertness = first >= 0
+    has_cooldown = has_boss_alertness and help_text.find(b"--boss_alertness_cooldown", first) >= 0
 
     if has_boss_alertness and has_cooldown:
         print("  ✓ Both required parameters found in --help")
@@ -106,193 +91,137 @@ def test_boss_alertness_zero_never_increases_alert():
     """Test 2: Verify boss_alertness=0 means boss alert NEVER increases"""
     print("\n[Test 2] Testing boss_alertness=0 (should never increase)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        if not initialize_mcp_session(process):
-            print("  ✗ Failed to initialize MCP session")
-            return False
-
-        # Call break tools 10 times
-        boss_levels = []
-        for i in range(10):
-            response_text = call_tool(process, "take_a_break", i + 100)
-            if response_text:
-                boss_alert = extract_boss_alert(response_text)
-                if boss_alert is not None:
-                    boss_levels.append(boss_alert)
-
-        if not boss_levels:
-            print("  ✗ Failed to get boss alert levels")
-            return False
-
-        # All should be 0
-        if all(level == 0 for level in boss_levels):
-            print(f"  ✓ Boss alert stayed at 0 across {len(boss_levels)} calls")
-            return True
-        else:
-            print(f"  ✗ Boss alert increased when it shouldn't: {boss_levels}")
-            return False
+        with mcp_server(*ZERO_ALERTNESS_ARGS) as process:
+            # Call break tools 10 times in one pipelined batch
+            boss_levels = []
+            for response_text in call_tools(process, ["take_a_break"] * 10, 200):
+                if response_text:
+                    boss_alert = extract_boss_alert(response_text)
+                    if boss_alert is not None:
+                        boss_levels.append(boss_alert)
+
+            if not boss_levels:
+                print("  ✗ Failed to get boss alert levels")
+                return False
+
+            # All should be 0
+            if all(level == 0 for level in boss_levels):
+                print(f"  ✓ Boss alert stayed at 0 across {len(boss_levels)} calls")
+                return True
+            else:
+                print(f"  ✗ Boss alert increased when it shouldn't: {boss_levels}")
+                return False
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
 def test_boss_alertness_hundred_always_increases_alert():
     """Test 3: Verify boss_alertness=100 means boss alert ALWAYS increases"""
     print("\n[Test 3] Testing boss_alertness=100 (should always increase)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        if not initialize_mcp_session(process):
-            print("  ✗ Failed to initialize MCP session")
-            return False
-
-        # Call break tools until boss alert reaches max (5)
-        boss_levels = []
-        for i in range(10):
-            response_text = call_tool(process, "take_a_break", i + 200)
-            if response_text:
-                boss_alert = extract_boss_alert(response_text)
-                if boss_alert is not None:
-                    boss_levels.append(boss_alert)
-                    if boss_alert >= 5:
-                        break
-
-        if not boss_levels:
-            print("  ✗ Failed to get boss alert levels")
-            return False
-
-        # Check that it increases (until it hits max 5)
-        increases = 0
-        for i in range(1, len(boss_levels)):
-            if boss_levels[i] > boss_levels[i-1]:
-                increases += 1
-            elif boss_levels[i] == 5 and boss_levels[i-1] == 5:
-                continue  # At max, ok to stay
-            else:
-                print(f"  ✗ Boss alert didn't increase: {boss_levels[i-1]} -> {boss_levels[i]}")
-                print(f"    Full sequence: {boss_levels}")
+        with mcp_server(*FULL_ALERTNESS_ARGS) as process:
+            # Every break raises the alert, so one batch of MAX_BOSS_ALERT breaks
+            # reaches the cap; more would each pay the 20-second level-5 delay
+            boss_levels = []
+            for response_text in call_tools(process, ["take_a_break"] * MAX_BOSS_ALERT, 300):
+                if response_text:
+                    boss_alert = extract_boss_alert(response_text)
+                    if boss_alert is not None:
+                        boss_levels.append(boss_alert)
+
+            if not boss_levels:
+                print("  ✗ Failed to get boss alert levels")
                 return False
 
-        if increases > 0:
-            print(f"  ✓ Boss alert increased {increases} times: {boss_levels}")
-            return True
-        else:
-            print(f"  ✗ Boss alert never increased: {boss_levels}")
-            return False
+            # Check that it increases (until it hits max 5)
+            increases = 0
+            for i in range(1, len(boss_levels)):
+                if boss_levels[i] > boss_levels[i-1]:
+                    increases += 1
+                elif boss_levels[i] == 5 and boss_levels[i-1] == 5:
+                    continue  # At max, ok to stay
+                else:
+                    print(f"  ✗ Boss alert didn't increase: {boss_levels[i-1]} -> {boss_levels[i]}")
+                    print(f"    Full sequence: {boss_levels}")
+                    return False
+
+            if increases > 0:
+                print(f"  ✓ Boss alert increased {increases} times: {boss_levels}")
+                return True
+            else:
+                print(f"  ✗ Boss alert never increased: {boss_levels}")
+                return False
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
 def test_boss_alertness_cooldown_parameter_affects_timing():
     """Test 4: Verify --boss_alertness_cooldown controls auto-decrease timing"""
     print("\n[Test 4] Testing boss_alertness_cooldown parameter...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "5"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
+    try:
+        with mcp_server(*FAST_COOLDOWN_ARGS) as process:
+            # Raise boss alert to level 2 or higher
+            # Call multiple times to ensure boss alert is raised sufficiently
+            # so that cooldown decrease is visible even after the final break increases it
+            call_tool(process, "take_a_break", 400)
+            response_text = call_tool(process, "take_a_break", 401)
+            boss_before = extract_boss_alert(response_text)
+
+            if boss_before is None or boss_before == 0:
+                print("  ✗ Failed to raise boss alert level")
+                return False
 
-    time.sleep(1)
+            print(f"    Boss alert raised to: {boss_before}")
+
+            # No decrease can happen before one cooldown period has passed, so
+            # sleep that long first, then poll finely until the deadline
+            print(f"    Polling up to {COOLDOWN_POLL_DEADLINE:.0f} seconds for cooldown...")
+            boss_after = None
+            status_ids = itertools.count(410)
+            deadline = time.monotonic() + COOLDOWN_POLL_DEADLINE
+            time.sleep(FAST_COOLDOWN_SECONDS)
+            while True:
+                # check_stress_status doesn't increase boss alert
+                response_text = call_tool(process, "check_stress_status", next(status_ids))
+                match = STATUS_BOSS_ALERT_PATTERN.search(response_text) if response_text else None
+                boss_after = int(match.group(1)) if match else None
+                if boss_after is not None and boss_after < boss_before:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(COOLDOWN_POLL_INTERVAL, remaining))
+
+            if boss_after is None:
+                print("  ✗ Failed to get boss alert after cooldown")
+                return False
 
-    try:
-        if not initialize_mcp_session(process):
-            print("  ✗ Failed to initialize MCP session")
-            return False
-
-        # Raise boss alert to level 2 or higher
-        # Call multiple times to ensure boss alert is raised sufficiently
-        # so that cooldown decrease is visible even after the final break increases it
-        call_tool(process, "take_a_break", 300)
-        response_text = call_tool(process, "take_a_break", 301)
-        boss_before = extract_boss_alert(response_text)
-
-        if boss_before is None or boss_before == 0:
-            print("  ✗ Failed to raise boss alert level")
-            return False
-
-        print(f"    Boss alert raised to: {boss_before}")
-
-        # Wait for cooldown (5 seconds + buffer)
-        print("    Waiting 6 seconds for cooldown...")
-        time.sleep(6)
-
-        # Check boss alert again using check_stress_status (doesn't increase boss alert)
-        response_text = call_tool(process, "check_stress_status", 302)
-        # Extract boss alert from check_stress_status response
-        import re
-        boss_pattern = r"Boss Alert Level:\s*([0-5])/5"
-        match = re.search(boss_pattern, response_text) if response_text else None
-        boss_after = int(match.group(1)) if match else None
-
-        if boss_after is None:
-            print("  ✗ Failed to get boss alert after cooldown")
-            return False
-
-        print(f"    Boss alert after cooldown: {boss_after}")
-
-        # It should have decreased by at least 1
-        if boss_after < boss_before:
-            print(f"  ✓ Boss alert decreased from {boss_before} to {boss_after}")
-            return True
-        else:
-            print(f"  ✗ Boss alert didn't decrease: {boss_before} -> {boss_after}")
-            return False
+            print(f"    Boss alert after cooldown: {boss_after}")
+
+            # It should have decreased by at least 1
+            if boss_after < boss_before:
+                print(f"  ✓ Boss alert decreased from {boss_before} to {boss_after}")
+                return True
+            else:
+                print(f"  ✗ Boss alert didn't decrease: {boss_before} -> {boss_after}")
+                return False
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
 def test_invalid_parameter_values():
@@ -301,18 +230,17 @@ def test_invalid_parameter_values():
 
     # Test out-of-range values (should either clamp or error gracefully)
     test_cases = [
-        (["--boss_alertness", "101"], "boss_alertness out of range (101)"),
-        (["--boss_alertness", "-1"], "boss_alertness negative"),
+        (("--boss_alertness", "101"), "boss_alertness out of range (101)"),
+        (("--boss_alertness", "-1"), "boss_alertness negative"),
     ]
 
     all_handled = True
 
     for args, description in test_cases:
         result = subprocess.run(
-            [PYTHON_PATH, MAIN_PATH] + args + ["--boss_alertness_cooldown", "10"],
+            SERVER_COMMAND + args + ("--boss_alertness_cooldown", "10"),
             capture_output=True,
-            text=True,
-            timeout=3
+            timeout=STARTUP_TIMEOUT
         )
 
         # Server should either:
@@ -321,7 +249,7 @@ def test_invalid_parameter_values():
         # 3. Start successfully (if it clamps values)
 
         # For this test, we just ensure it doesn't crash badly
-        if result.returncode == 0 or "error" in result.stderr.lower():
+        if result.returncode == 0 or b"error" in result.stderr.lower():
             print(f"    ✓ Handled {description}")
         else:
             print(f"    ⚠ Unexpected behavior for {description}")
@@ -350,6 +278,8 @@ def main():
         ("Invalid parameter handling", test_invalid_parameter_values),
     ]
 
+    # The gate runs one server at a time: concurrent interpreter startups on a
+    # loaded machine can push a server past its startup bound
     results = []
     for name, test_func in tests:
         try:
@@ -4,99 +4,56 @@ Integration Scenario Tests
 
 End-to-end tests for the required test scenarios from PRE_MISSION.md:310-317
 Combines multiple features to validate complete system behavior.
+
+Continuous breaks and boss alert progression drive a real `main.py`
+subprocess over stdio as smoke tests of the CLI and wire protocol; the
+remaining scenarios drive the server in-process through FastMCP's
+in-memory client.
 """
 
-import subprocess
-import json
+import functools
 import time
+import traceback
 import sys
-import os
-import re
-
-# Get the project root directory (parent of tests/)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
-MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
-
-STRESS_PATTERN = r"Stress Level:\s*(\d{1,3})"
-BOSS_PATTERN = r"Boss Alert Level:\s*([0-5])"
-
-
-def send_mcp_request(process, request):
-    """Send MCP request and get response"""
-    process.stdin.write(json.dumps(request) + "\n")
-    process.stdin.flush()
-    response_line = process.stdout.readline()
-    return json.loads(response_line) if response_line else None
-
-
-def initialize_mcp_session(process):
-    """Initialize MCP session"""
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test-client", "version": "1.0.0"}
-        }
-    }
-
-    send_mcp_request(process, init_request)
-
-    initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-    process.stdin.write(json.dumps(initialized) + "\n")
-    process.stdin.flush()
-
-
-def call_tool(process, tool_name, request_id):
-    """Call a tool and return the response text"""
-    call_request = {
-        "jsonrpc": "2.0",
-        "id": request_id,
-        "method": "tools/call",
-        "params": {"name": tool_name, "arguments": {}}
-    }
-
-    response = send_mcp_request(process, call_request)
-    if response and "result" in response and "content" in response["result"]:
-        content = response["result"]["content"]
-        if content and len(content) > 0 and "text" in content[0]:
-            return content[0]["text"]
-    return None
-
-
-def extract_state(response_text):
-    """Extract stress and boss alert from response"""
-    stress_match = re.search(STRESS_PATTERN, response_text)
-    boss_match = re.search(BOSS_PATTERN, response_text)
-
-    stress = int(stress_match.group(1)) if stress_match else None
-    boss = int(boss_match.group(1)) if boss_match else None
-
-    return stress, boss
-
 
+from _lanes import run_lanes
+from _mcp_helpers import (
+    call_tools,
+    extract_state,
+    in_process_server,
+    mcp_server,
+    shared_server,
+    stop_shared_servers,
+)
+
+# Scenarios that only read tool output share one in-process server per flag set
+SHARED_SERVER_ARGS = ("--boss_alertness", "50", "--boss_alertness_cooldown", "300")
+
+
+def scenario(title):
+    """Print a scenario's title and timing, turning exceptions into a failure"""
+    def decorator(test_func):
+        @functools.wraps(test_func)
+        def wrapper():
+            print(f"\n{title}")
+            started = time.perf_counter()
+            try:
+                return test_func()
+            except Exception as e:
+                print(f"  ✗ Error: {e}")
+                traceback.print_exc()
+                return False
+            finally:
+                print(f"    ({time.perf_counter() - started:.2f}s)")
+        return wrapper
+    return decorator
+
+
+@scenario("[Scenario 1] Continuous breaks (PRE_MISSION.md:313)...")
 def test_scenario_continuous_breaks():
     """Scenario #2: Multiple tools in sequence"""
-    print("\n[Scenario 1] Continuous breaks (PRE_MISSION.md:313)...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "75", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
-        # Call 8 different break tools sequentially
+    with mcp_server("--boss_alertness", "75", "--boss_alertness_cooldown", "300") as process:
+        # Call 8 different break tools in one pipelined batch
         tools = [
             "take_a_break", "watch_netflix", "show_meme",
             "bathroom_break", "coffee_mission", "urgent_call",
@@ -105,8 +62,8 @@ def test_scenario_continuous_breaks():
 
         states = []
 
-        for idx, tool_name in enumerate(tools):
-            response_text = call_tool(process, tool_name, 100 + idx)
+        responses = call_tools(process, tools, 100)
+        for idx, (tool_name, response_text) in enumerate(zip(tools, responses)):
             if response_text:
                 stress, boss = extract_state(response_text)
                 states.append((tool_name, stress, boss))
@@ -126,49 +83,25 @@ def test_scenario_continuous_breaks():
         print(f"  ✓ All {len(tools)} tools executed successfully")
         return True
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-
 
+@scenario("[Scenario 2] Stress accumulation (PRE_MISSION.md:314)...")
 def test_scenario_stress_accumulation_without_breaks():
     """Scenario #3: Stress builds over time"""
-    print("\n[Scenario 2] Stress accumulation (PRE_MISSION.md:314)...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
+    with in_process_server(
+        "--boss_alertness", "0", "--boss_alertness_cooldown", "300", "--enable_time_travel"
+    ) as server:
         # Get initial stress
-        response_text = call_tool(process, "take_a_break", 200)
+        response_text = server.call_tool("take_a_break")
         initial_stress, _ = extract_state(response_text)
 
         print(f"    Initial stress: {initial_stress}")
 
-        # Wait just over 1 minute for stress to accumulate
-        print("    Waiting 65 seconds for stress accumulation...")
-        time.sleep(65)
+        # Advance simulated time just over 1 minute for stress to accumulate
+        print("    Advancing 65 simulated seconds for stress accumulation...")
+        server.call_tool("advance_time", {"seconds": 65})
 
         # Use check_stress_status to see stress without taking a break
-        response_text = call_tool(process, "check_stress_status", 201)
+        response_text = server.call_tool("check_stress_status")
         final_stress, _ = extract_state(response_text)
 
         print(f"    Final stress: {final_stress}")
@@ -181,50 +114,28 @@ def test_scenario_stress_accumulation_without_breaks():
             print("  ℹ Mechanism may still work, test timing issue")
             return True  # Non-critical
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-
 
+@scenario("[Scenario 3] Boss alert progression 0→5...")
 def test_scenario_boss_alert_progression():
     """Test boss alert going from 0 to 5"""
-    print("\n[Scenario 3] Boss alert progression 0→5...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
-        # Take breaks until boss alert reaches 5
+    with mcp_server("--boss_alertness", "100", "--boss_alertness_cooldown", "300") as process:
+        # Take breaks until boss alert reaches 5. Each window pipelines only
+        # as many calls as the highest level seen says are still needed,
+        # so at 100% alertness the cap is hit without overshooting
         boss_progression = []
         attempts = 0
-
-        while len(boss_progression) < 20:
-            response_text = call_tool(process, "take_a_break", 300 + attempts)
-            if response_text:
-                _, boss = extract_state(response_text)
-                boss_progression.append(boss)
-                attempts += 1
-
-                if boss >= 5:
-                    break
+        highest = 0
+
+        while attempts < 20 and highest < 5:
+            window = min(5 - highest, 20 - attempts)
+            responses = call_tools(process, ["take_a_break"] * window, 300 + attempts)
+            attempts += window
+            for response_text in responses:
+                if response_text:
+                    _, boss = extract_state(response_text)
+                    if boss is not None:
+                        boss_progression.append(boss)
+                        highest = max(highest, boss)
 
         print(f"    Boss alert progression: {boss_progression}")
 
@@ -242,55 +153,31 @@ def test_scenario_boss_alert_progression():
             print(f"  ✗ Boss alert exceeded 5: max={max(boss_progression)}")
             return False
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-
 
+@scenario("[Scenario 4] Cooldown recovery (PRE_MISSION.md:317)...")
 def test_scenario_cooldown_recovery():
     """Scenario #6: Boss alert cooldown over extended time"""
-    print("\n[Scenario 4] Cooldown recovery (PRE_MISSION.md:317)...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "8"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
+    with in_process_server(
+        "--boss_alertness", "100", "--boss_alertness_cooldown", "8", "--enable_time_travel"
+    ) as server:
         # Raise boss alert to high level
         print("    Raising boss alert...")
         for i in range(5):
-            call_tool(process, "take_a_break", 400 + i)
+            server.call_tool("take_a_break")
 
         # Get current boss alert (use check_stress_status to not reset cooldown)
-        response_text = call_tool(process, "check_stress_status", 410)
+        response_text = server.call_tool("check_stress_status")
         _, initial_boss = extract_state(response_text)
 
         print(f"    Boss alert at: {initial_boss}")
 
-        # Wait for cooldowns (8 seconds each, wait for ~2 cooldowns)
+        # Advance past cooldowns (8 seconds each, ~2 cooldowns)
         wait_time = 18
-        print(f"    Waiting {wait_time} seconds for cooldowns...")
-        time.sleep(wait_time)
+        print(f"    Advancing {wait_time} simulated seconds for cooldowns...")
+        server.call_tool("advance_time", {"seconds": wait_time})
 
         # Check boss alert (use check_stress_status to not reset cooldown)
-        response_text = call_tool(process, "check_stress_status", 411)
+        response_text = server.call_tool("check_stress_status")
         _, final_boss = extract_state(response_text)
 
         print(f"    Boss alert after cooldowns: {final_boss}")
@@ -307,176 +194,86 @@ def test_scenario_cooldown_recovery():
             print(f"  ⚠ Boss alert unchanged: {initial_boss} -> {final_boss}")
             return True  # Non-critical
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-
 
+@scenario("[Scenario 5] Stress & boss management balance...")
 def test_scenario_stress_and_boss_management():
     """Test balancing stress relief and boss alert"""
-    print("\n[Scenario 5] Stress & boss management balance...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "10"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
+    with in_process_server(
+        "--boss_alertness", "50", "--boss_alertness_cooldown", "10", "--enable_time_travel"
+    ) as server:
         # Take some breaks
         print("    Taking 3 breaks...")
         for i in range(3):
-            response_text = call_tool(process, "take_a_break", 500 + i)
+            response_text = server.call_tool("take_a_break")
             stress, boss = extract_state(response_text)
             print(f"      Break {i+1}: stress={stress}, boss={boss}")
 
-        # Wait for cooldown
-        print("    Waiting 12 seconds for cooldown...")
-        time.sleep(12)
+        # Advance past one cooldown
+        print("    Advancing 12 simulated seconds for cooldown...")
+        server.call_tool("advance_time", {"seconds": 12})
 
         # Check state
-        response_text = call_tool(process, "take_a_break", 510)
+        response_text = server.call_tool("take_a_break")
         final_stress, final_boss = extract_state(response_text)
 
         print(f"    Final state: stress={final_stress}, boss={final_boss}")
         print("  ✓ Can manage both stress and boss alert metrics")
         return True
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
-
 
+@scenario("[Scenario 6] All tools working together...")
 def test_scenario_all_tools_work_together():
     """Test calling all 8+ tools in various orders"""
-    print("\n[Scenario 6] All tools working together...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
+    server = shared_server(SHARED_SERVER_ARGS)
 
-    try:
-        initialize_mcp_session(process)
-
-        # Call tools in different order
-        tool_sequence = [
-            "coffee_mission", "deep_thinking", "take_a_break",
-            "bathroom_break", "show_meme", "urgent_call",
-            "watch_netflix", "email_organizing"
-        ]
+    # Call tools in different order
+    tool_sequence = [
+        "coffee_mission", "deep_thinking", "take_a_break",
+        "bathroom_break", "show_meme", "urgent_call",
+        "watch_netflix", "email_organizing"
+    ]
 
-        successes = 0
+    successes = 0
 
-        for idx, tool_name in enumerate(tool_sequence):
-            response_text = call_tool(process, tool_name, 600 + idx)
-            if response_text:
-                stress, boss = extract_state(response_text)
-                if stress is not None and boss is not None:
-                    successes += 1
+    for response_text in server.call_tools(tool_sequence):
+        if response_text:
+            stress, boss = extract_state(response_text)
+            if stress is not None and boss is not None:
+                successes += 1
 
-        print(f"    {successes}/{len(tool_sequence)} tools executed successfully")
+    print(f"    {successes}/{len(tool_sequence)} tools executed successfully")
 
-        if successes == len(tool_sequence):
-            print("  ✓ All tools work together seamlessly")
-            return True
-        else:
-            print(f"  ✗ Only {successes}/{len(tool_sequence)} tools succeeded")
-            return False
-
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    if successes == len(tool_sequence):
+        print("  ✓ All tools work together seamlessly")
+        return True
+    else:
+        print(f"  ✗ Only {successes}/{len(tool_sequence)} tools succeeded")
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
+@scenario("[Scenario 7] Rapid sequential calls (thread safety)...")
 def test_scenario_rapid_sequential_calls():
     """Test rapid-fire tool calls (stress test)"""
-    print("\n[Scenario 7] Rapid sequential calls (thread safety)...")
-
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
+    server = shared_server(SHARED_SERVER_ARGS)
 
-    time.sleep(1)
-
-    try:
-        initialize_mcp_session(process)
-
-        # Rapidly call tools with minimal delay
-        rapid_calls = 10
-        successes = 0
-
-        for i in range(rapid_calls):
-            response_text = call_tool(process, "take_a_break", 700 + i)
-            if response_text:
-                stress, boss = extract_state(response_text)
-                if stress is not None and boss is not None:
-                    successes += 1
-            # Minimal delay
-            time.sleep(0.1)
+    # Rapidly call tools with no delay between them
+    rapid_calls = 10
+    successes = 0
 
-        print(f"    {successes}/{rapid_calls} rapid calls succeeded")
+    for response_text in server.call_tools(["take_a_break"] * rapid_calls):
+        if response_text:
+            stress, boss = extract_state(response_text)
+            if stress is not None and boss is not None:
+                successes += 1
 
-        if successes == rapid_calls:
-            print("  ✓ Thread safety maintained under rapid calls")
-            return True
-        else:
-            print(f"  ⚠ {rapid_calls - successes} calls failed")
-            return successes >= rapid_calls * 0.8  # 80% pass rate acceptable
+    print(f"    {successes}/{rapid_calls} rapid calls succeeded")
 
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+    if successes == rapid_calls:
+        print("  ✓ Thread safety maintained under rapid calls")
+        return True
+    else:
+        print(f"  ⚠ {rapid_calls - successes} calls failed")
+        return successes >= rapid_calls * 0.8  # 80% pass rate acceptable
 
 
 def main():
@@ -495,16 +292,22 @@ def main():
         ("Rapid sequential calls", test_scenario_rapid_sequential_calls),
     ]
 
-    results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n✗ Scenario '{name}' failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((name, False))
+    # Scenarios on a shared server must not overlap its state resets, so they
+    # run back to back in one lane; every other scenario gets its own
+    shared = {test_scenario_all_tools_work_together, test_scenario_rapid_sequential_calls}
+    lanes = [[test] for test in tests if test[1] not in shared]
+    lanes.append([test for test in tests if test[1] in shared])
+
+    # Scenarios mostly wait on their servers, so lanes run concurrently and
+    # each scenario's output is replayed in order afterwards
+    try:
+        outcomes = run_lanes(lanes, label="Scenario")
+    finally:
+        stop_shared_servers()
+
+    # Scenario prints landed in per-thread buffers; emit them in one write
+    sys.stdout.write("".join(outcomes[name][1] for name, _ in tests))
+    results = [(name, outcomes[name][0]) for name, _ in tests]
 
     print("\n" + "=" * 70)
     print("INTEGRATION SCENARIO RESULTS")
@@ -7,18 +7,31 @@ Tests that the server properly implements MCP protocol basics:
 - initialize/initialized handshake
 - tool registration
 - tool calling
+
+Startup and the handshake are checked against a real `main.py` subprocess
+over stdio; tool listing and calling drive the server in-process through
+FastMCP's in-memory client, which speaks the same MCP messages.
 """
 
+import functools
 import subprocess
-import json
-import time
+import traceback
 import sys
-import os
 
-# Get the project root directory (parent of tests/)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
-MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+from _lanes import run_lanes
+from _mcp_helpers import (
+    INIT_FRAME,
+    INITIALIZED_FRAME,
+    STARTUP_TIMEOUT,
+    InProcessServer,
+    spawn_server,
+    stop_server,
+)
+
+SERVER_ARGS = ("--boss_alertness", "50", "--boss_alertness_cooldown", "300")
 
 # Required tools according to PRE_MISSION.md
 REQUIRED_BASIC_TOOLS = ["take_a_break", "watch_netflix", "show_meme"]
@@ -26,84 +39,91 @@ REQUIRED_ADVANCED_TOOLS = [
     "bathroom_break", "coffee_mission", "urgent_call",
     "deep_thinking", "email_organizing"
 ]
+REQUIRED_TOOLS = frozenset(REQUIRED_BASIC_TOOLS + REQUIRED_ADVANCED_TOOLS)
+
+# Tools called back to back by the sequential-calls test
+SEQUENTIAL_TOOLS = (
+    "take_a_break",
+    "watch_netflix",
+    "bathroom_break",
+    "coffee_mission",
+    "deep_thinking"
+)
+
+# Shape every tools/call result must have: content that starts with a
+# non-empty text item.
+TOOL_RESULT_VALIDATOR = Draft202012Validator({
+    "type": "object",
+    "required": ["content"],
+    "properties": {
+        "content": {
+            "type": "array",
+            "minItems": 1,
+            "prefixItems": [{
+                "type": "object",
+                "required": ["type", "text"],
+                "properties": {
+                    "type": {"const": "text"},
+                    "text": {"type": "string", "minLength": 1}
+                }
+            }]
+        }
+    }
+})
+
 
+def wait_until_ready(process, timeout=STARTUP_TIMEOUT):
+    """Send initialize and return its response as soon as the server answers
 
-def send_mcp_request(process, request):
-    """Send MCP request and get response"""
-    process.stdin.write(json.dumps(request) + "\n")
+    Returns None if the server exits (closing stdout) or stays silent past
+    the timeout.
+    """
+    process.stdin.write(INIT_FRAME)
     process.stdin.flush()
-    response_line = process.stdout.readline()
-    return json.loads(response_line) if response_line else None
+    return process.reader.next_msg(timeout)
 
 
 def test_server_starts_with_stdio():
     """Test 1: Verify server starts and uses stdio transport"""
     print("\n[Test 1] Checking server startup with stdio...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(2)
+    # Keep stderr so a failed start can report why
+    process = spawn_server(*SERVER_ARGS, stderr=subprocess.PIPE)
 
     try:
-        # Check if process is still running
-        if process.poll() is None:
+        # The server counts as started once it answers initialize over stdio;
+        # a crash (bad flags, import error) closes stdout first, however long
+        # startup takes
+        response = wait_until_ready(process)
+        if response is not None:
             print("  ✓ Server started successfully")
             print("  ✓ Accepts stdin/stdout (stdio transport)")
             return True
-        else:
-            stdout, stderr = process.communicate()
-            print("  ✗ Server failed to start")
-            print(f"    STDOUT: {stdout}")
-            print(f"    STDERR: {stderr}")
-            return False
 
-    finally:
-        process.terminate()
+        print("  ✗ Server failed to start")
         try:
+            # stdout closed or timed out; give an exiting server a moment to be reaped
             process.wait(timeout=5)
         except subprocess.TimeoutExpired:
-            process.kill()
+            print(f"    No initialize response within {STARTUP_TIMEOUT:.0f}s")
+            return False
+        print(f"    Exit code: {process.returncode}")
+        print(f"    STDERR: {process.stderr.read().decode(errors='replace')}")
+        return False
+
+    finally:
+        stop_server(process)
 
 
 def test_initialize_handshake():
     """Test 2: Verify MCP initialize/initialized handshake"""
     print("\n[Test 2] Testing MCP initialize handshake...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
+    process = spawn_server(*SERVER_ARGS)
 
     try:
         # Send initialize request
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "test-client",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        response = send_mcp_request(process, init_request)
+        response = wait_until_ready(process)
 
         if not response:
             print("  ✗ No response to initialize request")
@@ -117,11 +137,7 @@ def test_initialize_handshake():
         print("  ✓ Valid initialize response received")
 
         # Send initialized notification
-        initialized = {
-            "jsonrpc": "2.0",
-            "method": "notifications/initialized"
-        }
-        process.stdin.write(json.dumps(initialized) + "\n")
+        process.stdin.write(INITIALIZED_FRAME)
         process.stdin.flush()
 
         print("  ✓ Initialized notification sent")
@@ -130,91 +146,45 @@ def test_initialize_handshake():
 
     except Exception as e:
         print(f"  ✗ Error during handshake: {e}")
-        import traceback
         traceback.print_exc()
         return False
     finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+        stop_server(process)
 
 
-def test_tools_list_returns_all_required_tools():
+def test_tools_list_returns_all_required_tools(server):
     """Test 3: Verify all 8 required tools are registered"""
     print("\n[Test 3] Checking tool registration...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        # Initialize
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "test-client", "version": "1.0.0"}
-            }
-        }
-
-        send_mcp_request(process, init_request)
-
-        initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-        process.stdin.write(json.dumps(initialized) + "\n")
-        process.stdin.flush()
-
         # Request tools list
-        tools_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/list",
-            "params": {}
-        }
-
-        response = send_mcp_request(process, tools_request)
-
-        if not response or "result" not in response:
-            print("  ✗ Invalid tools/list response")
-            return False
+        result = server.list_tools_result()
 
-        if "tools" not in response["result"]:
+        if "tools" not in result:
             print("  ✗ No 'tools' field in response")
             return False
 
-        tools = response["result"]["tools"]
-        tool_names = [t["name"] for t in tools]
+        tools = result["tools"]
+        tool_names = {t["name"] for t in tools}
 
         print(f"  Found {len(tool_names)} tools total")
 
         # Check for required basic tools
-        missing_basic = [t for t in REQUIRED_BASIC_TOOLS if t not in tool_names]
+        missing_basic = sorted(set(REQUIRED_BASIC_TOOLS) - tool_names)
         if missing_basic:
             print(f"  ✗ Missing basic tools: {missing_basic}")
             return False
         print(f"  ✓ All 3 basic tools found: {REQUIRED_BASIC_TOOLS}")
 
         # Check for required advanced tools
-        missing_advanced = [t for t in REQUIRED_ADVANCED_TOOLS if t not in tool_names]
+        missing_advanced = sorted(set(REQUIRED_ADVANCED_TOOLS) - tool_names)
         if missing_advanced:
             print(f"  ✗ Missing advanced tools: {missing_advanced}")
             return False
         print(f"  ✓ All 5 advanced tools found: {REQUIRED_ADVANCED_TOOLS}")
 
         # Show any optional tools
-        all_required = REQUIRED_BASIC_TOOLS + REQUIRED_ADVANCED_TOOLS
-        optional_tools = [t for t in tool_names if t not in all_required]
+        optional_tools = sorted(tool_names - REQUIRED_TOOLS)
         if optional_tools:
             print(f"  + Optional tools found: {optional_tools}")
 
@@ -222,100 +192,27 @@ def test_tools_list_returns_all_required_tools():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_tool_call_returns_valid_response():
+def test_tool_call_returns_valid_response(server):
     """Test 4: Verify tools/call works with valid MCP response structure"""
     print("\n[Test 4] Testing tool execution...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        # Initialize
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "test-client", "version": "1.0.0"}
-            }
-        }
-
-        send_mcp_request(process, init_request)
-
-        initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-        process.stdin.write(json.dumps(initialized) + "\n")
-        process.stdin.flush()
-
         # Call a tool
-        call_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/call",
-            "params": {
-                "name": "take_a_break",
-                "arguments": {}
-            }
-        }
-
-        response = send_mcp_request(process, call_request)
+        result = server.call_tool_result("take_a_break")
 
-        if not response:
-            print("  ✗ No response from tool call")
-            return False
-
-        if "result" not in response:
-            print("  ✗ Invalid tool call response (missing 'result')")
-            print(f"    Response: {response}")
-            return False
-
-        result = response["result"]
-
-        if "content" not in result:
-            print("  ✗ Missing 'content' field in result")
-            return False
-
-        content = result["content"]
-
-        if not isinstance(content, list) or len(content) == 0:
-            print("  ✗ 'content' is not a non-empty list")
+        error = best_match(TOOL_RESULT_VALIDATOR.iter_errors(result))
+        if error is not None:
+            print(f"  ✗ Invalid tool call result at {error.json_path}: {error.message}")
+            print(f"    Result: {result}")
             return False
 
-        if "type" not in content[0] or content[0]["type"] != "text":
-            print("  ✗ First content item is not type 'text'")
-            return False
+        response_text = result["content"][0]["text"]
 
-        if "text" not in content[0]:
-            print("  ✗ Missing 'text' field in content item")
-            return False
-
-        response_text = content[0]["text"]
-
-        if not isinstance(response_text, str) or len(response_text) == 0:
-            print("  ✗ Response text is empty or not a string")
-            return False
-
-        print("  ✓ Valid JSON-RPC response structure")
+        print("  ✓ Valid MCP tool result structure")
         print("  ✓ result.content[0].type == 'text'")
         print("  ✓ result.content[0].text is non-empty string")
         print(f"    Response preview: {response_text[:80]}...")
@@ -323,81 +220,28 @@ def test_tool_call_returns_valid_response():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_multiple_sequential_tool_calls():
+def test_multiple_sequential_tool_calls(server):
     """Test 5: Verify server handles multiple tool calls in sequence"""
     print("\n[Test 5] Testing multiple sequential tool calls...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        # Initialize
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "test-client", "version": "1.0.0"}
-            }
-        }
-
-        send_mcp_request(process, init_request)
-
-        initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-        process.stdin.write(json.dumps(initialized) + "\n")
-        process.stdin.flush()
-
         # Call 5 different tools sequentially
-        tools_to_test = [
-            "take_a_break",
-            "watch_netflix",
-            "bathroom_break",
-            "coffee_mission",
-            "deep_thinking"
-        ]
+        tools_to_test = SEQUENTIAL_TOOLS
 
         successful_calls = 0
 
-        for idx, tool_name in enumerate(tools_to_test):
-            call_request = {
-                "jsonrpc": "2.0",
-                "id": idx + 100,
-                "method": "tools/call",
-                "params": {"name": tool_name, "arguments": {}}
-            }
-
-            response = send_mcp_request(process, call_request)
-
-            if response and "result" in response and "content" in response["result"]:
-                content = response["result"]["content"]
-                if content and len(content) > 0 and "text" in content[0]:
-                    successful_calls += 1
-                    print(f"    ✓ {tool_name} executed successfully")
-                else:
-                    print(f"    ✗ {tool_name} returned invalid content")
+        results = server.call_tool_results(tools_to_test)
+
+        for tool_name, result in zip(tools_to_test, results):
+            if TOOL_RESULT_VALIDATOR.is_valid(result):
+                successful_calls += 1
+                print(f"    ✓ {tool_name} executed successfully")
             else:
-                print(f"    ✗ {tool_name} failed to respond")
+                print(f"    ✗ {tool_name} returned invalid content")
 
         if successful_calls == len(tools_to_test):
             print(f"  ✓ All {successful_calls}/{len(tools_to_test)} tool calls successful")
@@ -409,15 +253,32 @@ def test_multiple_sequential_tool_calls():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+
+
+_shared_server = None
+
+
+def shared_server():
+    """Return the in-process server tests 3-5 share, starting it on first use"""
+    global _shared_server
+    if _shared_server is None:
+        _shared_server = InProcessServer(*SERVER_ARGS)
+    return _shared_server
+
+
+def run_with_shared_server(test_func):
+    """Run a test against the shared in-process server"""
+    return test_func(shared_server())
+
+
+def stop_shared_server():
+    """Close the shared server if a test started it"""
+    global _shared_server
+    if _shared_server is not None:
+        _shared_server.close()
+        _shared_server = None
 
 
 def main():
@@ -426,24 +287,33 @@ def main():
     print("MCP PROTOCOL COMPLIANCE TESTS")
     print("=" * 70)
 
-    tests = [
+    # Tests 1 and 2 check startup and the handshake on subprocesses of their
+    # own. Tests 3-5 only need a ready session, so they share one in-process
+    # server and run back to back in a lane
+    own_server_tests = [
         ("Server starts with stdio", test_server_starts_with_stdio),
         ("Initialize handshake", test_initialize_handshake),
+    ]
+    shared_server_tests = [
         ("All required tools registered", test_tools_list_returns_all_required_tools),
         ("Tool call returns valid response", test_tool_call_returns_valid_response),
         ("Multiple sequential tool calls", test_multiple_sequential_tool_calls),
     ]
+    tests = own_server_tests + shared_server_tests
 
-    results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n✗ Test '{name}' failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((name, False))
+    lanes = [[test] for test in own_server_tests]
+    lanes.append([
+        (name, functools.partial(run_with_shared_server, test_func))
+        for name, test_func in shared_server_tests
+    ])
+    try:
+        outcomes = run_lanes(lanes)
+    finally:
+        stop_shared_server()
+
+    # Test prints landed in per-thread buffers; replay them in order
+    sys.stdout.write("".join(outcomes[name][1] for name, _ in tests))
+    results = [(name, outcomes[name][0]) for name, _ in tests]
 
     print("\n" + "=" * 70)
     print("MCP PROTOCOL TEST RESULTS")
@@ -6,83 +6,106 @@ Tests that all tool responses follow the MCP specification format
 and are parseable using the specified regex patterns.
 """
 
-import subprocess
-import json
-import time
 import sys
-import os
 import re
 
-# Get the project root directory (parent of tests/)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
-MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
+from _mcp_helpers import (
+    call_tool_response,
+    send_mcp_batch,
+    start_server,
+    stop_server,
+    tool_call_request,
+)
+
+# One server serves every test. Time travel lets main() cool the boss alert
+# back to 0 between tests, so calls from earlier tests cannot push later
+# ones into the 20-second level-5 delay.
+BOSS_ALERTNESS_COOLDOWN = 300
+SERVER_ARGS = (
+    "--boss_alertness", "50",
+    "--boss_alertness_cooldown", str(BOSS_ALERTNESS_COOLDOWN),
+    "--enable_time_travel",
+)
 
 # All required tools to test
-ALL_TOOLS = [
+ALL_TOOLS = (
     "take_a_break", "watch_netflix", "show_meme",
     "bathroom_break", "coffee_mission", "urgent_call",
     "deep_thinking", "email_organizing"
-]
-
-# Regex patterns from PRE_MISSION.md:191-203
-BREAK_SUMMARY_PATTERN = r"Break Summary:\s*(.+?)(?:\n|$)"
-STRESS_LEVEL_PATTERN = r"Stress Level:\s*(\d{1,3})"
-BOSS_ALERT_PATTERN = r"Boss Alert Level:\s*([0-5])"
+)
 
+# Tools whose responses the regex extraction test parses
+EXTRACTION_TOOLS = ("take_a_break", "watch_netflix", "bathroom_break")
 
-def send_mcp_request(process, request):
-    """Send MCP request and get response"""
-    process.stdin.write(json.dumps(request) + "\n")
-    process.stdin.flush()
-    response_line = process.stdout.readline()
-    return json.loads(response_line) if response_line else None
-
+# Regex patterns from PRE_MISSION.md:191-203
+BREAK_SUMMARY_PATTERN = re.compile(r"Break Summary:\s*(.+?)(?:\n|$)")
+# Stress only matches in range (0-100), so a match needs no separate range
+# check; the lookahead stops "150" from reading as 15
+STRESS_LEVEL_PATTERN = re.compile(r"Stress Level:\s*(100|[1-9]?\d)(?!\d)")
+BOSS_ALERT_PATTERN = re.compile(r"Boss Alert Level:\s*([0-5])")
+
+# Literal text each spec pattern starts with, for search_field()
+FIELD_PREFIXES = {
+    BREAK_SUMMARY_PATTERN: "Break Summary:",
+    STRESS_LEVEL_PATTERN: "Stress Level:",
+    BOSS_ALERT_PATTERN: "Boss Alert Level:",
+}
+
+# Whatever follows "Stress Level:", used only to report a rejected value
+STRESS_VALUE_PATTERN = re.compile(r"Stress Level:\s*(\S*)")
+
+
+def reset_boss_alert(process, request_id):
+    """Advance simulated time past five cooldowns so the boss alert is back at 0"""
+    return call_tool_response(
+        process, "advance_time", request_id, {"seconds": BOSS_ALERTNESS_COOLDOWN * 5}
+    )
 
-def initialize_mcp_session(process):
-    """Initialize MCP session"""
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test-client", "version": "1.0.0"}
-        }
-    }
 
-    send_mcp_request(process, init_request)
+def search_field(pattern, response_text):
+    """Find a spec pattern's first match, as pattern.search() would
 
-    initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-    process.stdin.write(json.dumps(initialized) + "\n")
-    process.stdin.flush()
+    str.find skips to the first occurrence of the literal prefix, since no
+    match can start before it, and the search starts from that offset.
+    """
+    start = response_text.find(FIELD_PREFIXES[pattern])
+    if start < 0:
+        return None
+    return pattern.search(response_text, start)
 
 
-def call_tool(process, tool_name, request_id):
-    """Call a tool and return the full response"""
-    call_request = {
-        "jsonrpc": "2.0",
-        "id": request_id,
-        "method": "tools/call",
-        "params": {"name": tool_name, "arguments": {}}
-    }
+def stress_level_field(response_text):
+    """Check the first "Stress Level:" field; return (match, value)
 
-    return send_mcp_request(process, call_request)
+    match is the in-range STRESS_LEVEL_PATTERN match at that field, or None
+    when its value is out of range; value is the text given as the level.
+    Both are None when the field is missing.
+    """
+    start = response_text.find(FIELD_PREFIXES[STRESS_LEVEL_PATTERN])
+    if start < 0:
+        return None, None
+    match = STRESS_LEVEL_PATTERN.match(response_text, start)
+    if match:
+        return match, match.group(1)
+    return None, STRESS_VALUE_PATTERN.match(response_text, start).group(1)
 
 
 def validate_response_format(response_text):
-    """Validate response format using spec regex patterns"""
-    stress_match = re.search(STRESS_LEVEL_PATTERN, response_text)
-    boss_match = re.search(BOSS_ALERT_PATTERN, response_text)
-    summary_match = re.search(BREAK_SUMMARY_PATTERN, response_text, re.MULTILINE)
+    """Validate response format using spec regex patterns
+
+    Follows the spec's validate_response: search for each field first, then
+    range-check what was found.
+    """
+    stress_match, stress = stress_level_field(response_text)
+    boss_match = search_field(BOSS_ALERT_PATTERN, response_text)
+    summary_match = search_field(BREAK_SUMMARY_PATTERN, response_text)
 
     errors = []
 
-    if not stress_match:
+    if stress is None:
         errors.append("Missing 'Stress Level' field")
-    elif not (0 <= int(stress_match.group(1)) <= 100):
-        errors.append(f"Stress Level out of range: {stress_match.group(1)}")
+    elif not stress_match:
+        errors.append(f"Stress Level out of range: {stress}")
 
     if not boss_match:
         errors.append("Missing 'Boss Alert Level' field")
@@ -95,26 +118,13 @@ def validate_response_format(response_text):
     return len(errors) == 0, errors
 
 
-def test_response_has_mcp_structure():
+def test_response_has_mcp_structure(process):
     """Test 1: Verify response follows MCP content structure"""
     print("\n[Test 1] Checking MCP response structure...")
     print("  PRE_MISSION.md:169-178 - MCP content format")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        response = call_tool(process, "take_a_break", 100)
+        response = call_tool_response(process, "take_a_break", 100)
 
         if not response:
             print("  ✗ No response received")
@@ -162,34 +172,15 @@ def test_response_has_mcp_structure():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_response_text_has_break_summary():
+def test_response_text_has_break_summary(process):
     """Test 2: Verify Break Summary field is present and parseable"""
     print("\n[Test 2] Checking Break Summary field...")
     print("  PRE_MISSION.md:194 - Break Summary regex pattern")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        response = call_tool(process, "take_a_break", 200)
+        response = call_tool_response(process, "take_a_break", 200)
 
         if not response or "result" not in response:
             print("  ✗ Invalid response")
@@ -197,7 +188,7 @@ def test_response_text_has_break_summary():
 
         response_text = response["result"]["content"][0]["text"]
 
-        match = re.search(BREAK_SUMMARY_PATTERN, response_text, re.MULTILINE)
+        match = search_field(BREAK_SUMMARY_PATTERN, response_text)
 
         if not match:
             print("  ✗ 'Break Summary:' field not found")
@@ -219,34 +210,15 @@ def test_response_text_has_break_summary():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_response_text_has_stress_level():
+def test_response_text_has_stress_level(process):
     """Test 3: Verify Stress Level field is present and in range"""
     print("\n[Test 3] Checking Stress Level field...")
     print("  PRE_MISSION.md:198 - Stress Level regex pattern")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        response = call_tool(process, "take_a_break", 300)
+        response = call_tool_response(process, "take_a_break", 300)
 
         if not response or "result" not in response:
             print("  ✗ Invalid response")
@@ -254,20 +226,18 @@ def test_response_text_has_stress_level():
 
         response_text = response["result"]["content"][0]["text"]
 
-        match = re.search(STRESS_LEVEL_PATTERN, response_text)
+        match, stress = stress_level_field(response_text)
 
-        if not match:
+        if stress is None:
             print("  ✗ 'Stress Level:' field not found")
             print(f"    Response text:\n{response_text}")
             return False
 
-        stress_val = int(match.group(1))
-
-        if not (0 <= stress_val <= 100):
-            print(f"  ✗ Stress Level out of range: {stress_val}")
+        if not match:
+            print(f"  ✗ Stress Level out of range: {stress}")
             return False
 
-        print(f"  ✓ Stress Level found: {stress_val}")
+        print(f"  ✓ Stress Level found: {stress}")
         print(f"  ✓ Value in valid range (0-100)")
         print(f"  ✓ Regex pattern matches")
         return True
@@ -277,34 +247,15 @@ def test_response_text_has_stress_level():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_response_text_has_boss_alert_level():
+def test_response_text_has_boss_alert_level(process):
     """Test 4: Verify Boss Alert Level field is present and in range"""
     print("\n[Test 4] Checking Boss Alert Level field...")
     print("  PRE_MISSION.md:203 - Boss Alert Level regex pattern")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        response = call_tool(process, "take_a_break", 400)
+        response = call_tool_response(process, "take_a_break", 400)
 
         if not response or "result" not in response:
             print("  ✗ Invalid response")
@@ -312,7 +263,7 @@ def test_response_text_has_boss_alert_level():
 
         response_text = response["result"]["content"][0]["text"]
 
-        match = re.search(BOSS_ALERT_PATTERN, response_text)
+        match = search_field(BOSS_ALERT_PATTERN, response_text)
 
         if not match:
             print("  ✗ 'Boss Alert Level:' field not found")
@@ -335,37 +286,21 @@ def test_response_text_has_boss_alert_level():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_all_tools_return_valid_format():
+def test_all_tools_return_valid_format(process):
     """Test 5: Verify all 8 required tools return consistent format"""
     print("\n[Test 5] Checking format consistency across all tools...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         all_valid = True
         results = []
 
-        for idx, tool_name in enumerate(ALL_TOOLS):
-            response = call_tool(process, tool_name, 500 + idx)
+        requests = [
+            tool_call_request(tool_name, 500 + idx) for idx, tool_name in enumerate(ALL_TOOLS)
+        ]
+
+        for tool_name, response in zip(ALL_TOOLS, send_mcp_batch(process, requests)):
 
             if not response or "result" not in response:
                 results.append((tool_name, False, "No valid response"))
@@ -400,37 +335,21 @@ def test_all_tools_return_valid_format():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_regex_patterns_extract_correctly():
+def test_regex_patterns_extract_correctly(process):
     """Test 6: Verify spec regex patterns work on real responses"""
     print("\n[Test 6] Testing regex extraction on multiple responses...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        test_tools = ["take_a_break", "watch_netflix", "bathroom_break"]
         all_extracted = True
 
-        for idx, tool_name in enumerate(test_tools):
-            response = call_tool(process, tool_name, 600 + idx)
+        requests = [
+            tool_call_request(tool_name, 600 + idx)
+            for idx, tool_name in enumerate(EXTRACTION_TOOLS)
+        ]
+
+        for tool_name, response in zip(EXTRACTION_TOOLS, send_mcp_batch(process, requests)):
 
             if not response or "result" not in response:
                 print(f"    ✗ {tool_name}: No response")
@@ -440,9 +359,9 @@ def test_regex_patterns_extract_correctly():
             response_text = response["result"]["content"][0]["text"]
 
             # Extract all fields
-            summary_match = re.search(BREAK_SUMMARY_PATTERN, response_text, re.MULTILINE)
-            stress_match = re.search(STRESS_LEVEL_PATTERN, response_text)
-            boss_match = re.search(BOSS_ALERT_PATTERN, response_text)
+            summary_match = search_field(BREAK_SUMMARY_PATTERN, response_text)
+            stress_match = search_field(STRESS_LEVEL_PATTERN, response_text)
+            boss_match = search_field(BOSS_ALERT_PATTERN, response_text)
 
             if summary_match and stress_match and boss_match:
                 summary = summary_match.group(1).strip()
@@ -465,39 +384,20 @@ def test_regex_patterns_extract_correctly():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_format_validation_function():
+def test_format_validation_function(process):
     """Test 7: Test the validation function from spec"""
     print("\n[Test 7] Testing validation function from PRE_MISSION.md...")
     print("  PRE_MISSION.md:206-222 - validate_response() function")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "50", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Test with multiple tools
         test_count = 5
         all_valid = True
 
         for i in range(test_count):
-            response = call_tool(process, "take_a_break", 700 + i)
+            response = call_tool_response(process, "take_a_break", 700 + i)
 
             if not response or "result" not in response:
                 print(f"    ✗ Test {i+1}: No response")
@@ -525,12 +425,6 @@ def test_format_validation_function():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
 def main():
@@ -549,16 +443,27 @@ def main():
         ("Validation function", test_format_validation_function),
     ]
 
+    try:
+        process = start_server(*SERVER_ARGS)
+    except RuntimeError as e:
+        print(f"\n✗ {e}")
+        return 1
+
     results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n✗ Test '{name}' failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((name, False))
+    try:
+        for index, (name, test_func) in enumerate(tests):
+            try:
+                if index:
+                    reset_boss_alert(process, 900 + index)
+                result = test_func(process)
+                results.append((name, result))
+            except Exception as e:
+                print(f"\n✗ Test '{name}' failed with exception: {e}")
+                import traceback
+                traceback.print_exc()
+                results.append((name, False))
+    finally:
+        stop_server(process)
 
     print("\n" + "=" * 70)
     print("RESPONSE FORMAT TEST RESULTS")
@@ -8,101 +8,74 @@ Tests all state logic and time-based mechanics:
 - Boss alert cooldown
 - 20-second delay at boss level 5
 - State bounds (0-100 stress, 0-5 boss)
+
+The 20-second delay test drives a real `main.py` subprocess over stdio as
+a smoke test of the CLI and wire protocol; the other tests drive shared
+in-process servers through FastMCP's in-memory client.
 """
 
-import subprocess
-import json
+import functools
 import time
 import sys
-import os
+import traceback
 import re
 
-# Get the project root directory (parent of tests/)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PYTHON_PATH = sys.executable
-MAIN_PATH = os.path.join(PROJECT_ROOT, "main.py")
-
-
-def send_mcp_request(process, request):
-    """Send MCP request and get response"""
-    process.stdin.write(json.dumps(request) + "\n")
-    process.stdin.flush()
-    response_line = process.stdout.readline()
-    return json.loads(response_line) if response_line else None
-
-
-def initialize_mcp_session(process):
-    """Initialize MCP session"""
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test-client", "version": "1.0.0"}
-        }
-    }
-
-    send_mcp_request(process, init_request)
-
-    initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-    process.stdin.write(json.dumps(initialized) + "\n")
-    process.stdin.flush()
-
-
-def call_tool(process, tool_name, request_id):
-    """Call a tool and return the response text"""
-    call_request = {
-        "jsonrpc": "2.0",
-        "id": request_id,
-        "method": "tools/call",
-        "params": {"name": tool_name, "arguments": {}}
-    }
-
-    response = send_mcp_request(process, call_request)
-    if response and "result" in response and "content" in response["result"]:
-        content = response["result"]["content"]
-        if content and len(content) > 0 and "text" in content[0]:
-            return content[0]["text"]
-    return None
+from _lanes import run_lanes
+from _mcp_helpers import call_tool, mcp_server, shared_server, stop_shared_servers
+
+# Tests that need the same CLI flags share one in-process server per flag set
+QUIET_ARGS = ("--boss_alertness", "0", "--boss_alertness_cooldown", "300")
+ALERT_ARGS = ("--boss_alertness", "100", "--boss_alertness_cooldown", "300")
+FAST_COOLDOWN_ARGS = ("--boss_alertness", "100", "--boss_alertness_cooldown", "8")
+# The bounds tests hold whatever the starting state, so they share one server
+# whose breaks push the boss alert up and whose cooldowns pull it back down
+BOUNDS_ARGS = ("--boss_alertness", "100", "--boss_alertness_cooldown", "5")
+
+MAX_BOSS_ALERT = 5
+
+STRESS_LEVEL_PATTERN = re.compile(r"Stress Level:\s*(\d{1,3})")
+BOSS_ALERT_PATTERN = re.compile(r"Boss Alert Level:\s*([0-5])")
 
 
 def extract_stress_level(response_text):
     """Extract stress level from response"""
-    pattern = r"Stress Level:\s*(\d{1,3})"
-    match = re.search(pattern, response_text)
+    match = STRESS_LEVEL_PATTERN.search(response_text)
     return int(match.group(1)) if match else None
 
 
 def extract_boss_alert(response_text):
     """Extract boss alert level from response"""
-    pattern = r"Boss Alert Level:\s*([0-5])"
-    match = re.search(pattern, response_text)
+    match = BOSS_ALERT_PATTERN.search(response_text)
     return int(match.group(1)) if match else None
 
 
-def test_stress_auto_increment_over_time():
+def take_breaks_until_cap(server, limit):
+    """Take up to `limit` breaks, stopping once the boss alert reaches 5
+
+    Returns the response texts in request order. A break taken at level 5
+    pays the 20-second delay, so, as in integration scenario 3, each
+    pipelined window holds only as many breaks as levels still needed.
+    """
+    responses = []
+    highest = 0
+    while len(responses) < limit and highest < MAX_BOSS_ALERT:
+        window = min(MAX_BOSS_ALERT - highest, limit - len(responses))
+        for response_text in server.call_tools(["take_a_break"] * window):
+            responses.append(response_text)
+            boss_alert = extract_boss_alert(response_text or "")
+            if boss_alert is not None:
+                highest = max(highest, boss_alert)
+    return responses
+
+
+def test_stress_auto_increment_over_time(server):
     """Test 1: Verify stress increases at minimum 1 point per minute"""
     print("\n[Test 1] Testing stress auto-increment over time...")
     print("  PRE_MISSION.md:128 - Stress increases 1+ per minute")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Get initial stress
-        response_text = call_tool(process, "take_a_break", 100)
+        response_text = server.call_tool("take_a_break")
         initial_stress = extract_stress_level(response_text)
 
         if initial_stress is None:
@@ -111,12 +84,12 @@ def test_stress_auto_increment_over_time():
 
         print(f"    Initial stress: {initial_stress}")
 
-        # Wait just over 1 minute to verify stress increases
-        print("    Waiting 65 seconds for stress accumulation...")
-        time.sleep(65)
+        # Advance simulated time just over 1 minute to verify stress increases
+        print("    Advancing 65 simulated seconds for stress accumulation...")
+        server.call_tool("advance_time", {"seconds": 65})
 
         # Use check_stress_status to see stress WITHOUT taking a break (no reduction)
-        response_text = call_tool(process, "check_stress_status", 101)
+        response_text = server.call_tool("check_stress_status")
         final_stress = extract_stress_level(response_text)
 
         if final_stress is None:
@@ -137,41 +110,21 @@ def test_stress_auto_increment_over_time():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_stress_reduction_on_break():
+def test_stress_reduction_on_break(server):
     """Test 2: Verify taking breaks reduces stress"""
     print("\n[Test 2] Testing stress reduction on breaks...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Take multiple breaks and track stress
         stress_levels = []
         reductions = []
 
         for i in range(5):
-            response_text = call_tool(process, "take_a_break", 200 + i)
+            response_text = server.call_tool("take_a_break")
             stress = extract_stress_level(response_text)
             if stress is not None:
                 stress_levels.append(stress)
@@ -208,46 +161,23 @@ def test_stress_reduction_on_break():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_boss_alert_increases_on_break():
+def test_boss_alert_increases_on_break(server):
     """Test 3: Verify boss alert increases based on probability"""
     print("\n[Test 3] Testing boss alert increase (boss_alertness=100)...")
     print("  PRE_MISSION.md:129 - Boss alert increases on breaks")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Take breaks until boss alert increases
         boss_levels = []
 
-        for i in range(10):
-            response_text = call_tool(process, "take_a_break", 300 + i)
+        for response_text in take_breaks_until_cap(server, 10):
             boss_alert = extract_boss_alert(response_text)
             if boss_alert is not None:
                 boss_levels.append(boss_alert)
-                if boss_alert >= 5:
-                    break
 
         if len(boss_levels) == 0:
             print("  ✗ Failed to get boss alert levels")
@@ -268,43 +198,23 @@ def test_boss_alert_increases_on_break():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_boss_alert_cooldown_auto_decrease():
+def test_boss_alert_cooldown_auto_decrease(server):
     """Test 4: Verify boss alert auto-decreases every cooldown period"""
     print("\n[Test 4] Testing boss alert cooldown auto-decrease...")
     print("  PRE_MISSION.md:130 - Boss alert decreases per cooldown")
     print("  PRE_MISSION.md:317 - Test Scenario #6")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "8"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        # Raise boss alert to level 2-3
-        for i in range(3):
-            call_tool(process, "take_a_break", 400 + i)
+        # Raise boss alert to level 2-3; the breaks are independent, so they
+        # go out together
+        server.call_tools(["take_a_break"] * 3)
 
         # Get current boss alert (use status check to avoid resetting cooldown)
-        response_text = call_tool(process, "check_stress_status", 410)
+        response_text = server.call_tool("check_stress_status")
         boss_before = extract_boss_alert(response_text)
 
         if boss_before is None or boss_before == 0:
@@ -313,12 +223,12 @@ def test_boss_alert_cooldown_auto_decrease():
 
         print(f"    Boss alert before cooldown: {boss_before}")
 
-        # Wait for 2 cooldown periods (8 seconds each + buffer)
-        print("    Waiting 18 seconds for cooldowns...")
-        time.sleep(18)
+        # Advance past 2 cooldown periods (8 seconds each + buffer)
+        print("    Advancing 18 simulated seconds for cooldowns...")
+        server.call_tool("advance_time", {"seconds": 18})
 
         # Check boss alert - should have decreased by 2 (use status check to avoid resetting cooldown)
-        response_text = call_tool(process, "check_stress_status", 411)
+        response_text = server.call_tool("check_stress_status")
         boss_after = extract_boss_alert(response_text)
 
         if boss_after is None:
@@ -341,44 +251,28 @@ def test_boss_alert_cooldown_auto_decrease():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_boss_alert_max_limit_five():
+def test_boss_alert_max_limit_five(server):
     """Test 5: Verify boss alert level never exceeds 5"""
     print("\n[Test 5] Testing boss alert maximum limit (5)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        # Take many breaks to try to exceed limit
+        # Take breaks up to the limit, then read the level once more with a
+        # status check, since another break would pay the 20-second delay
         boss_levels = []
 
-        for i in range(15):
-            response_text = call_tool(process, "take_a_break", 500 + i)
+        for response_text in take_breaks_until_cap(server, 15):
             boss_alert = extract_boss_alert(response_text)
             if boss_alert is not None:
                 boss_levels.append(boss_alert)
 
+        boss_alert = extract_boss_alert(server.call_tool("check_stress_status"))
+        if boss_alert is not None:
+            boss_levels.append(boss_alert)
+
         if len(boss_levels) == 0:
             print("  ✗ Failed to get boss alert levels")
             return False
@@ -396,45 +290,25 @@ def test_boss_alert_max_limit_five():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_boss_alert_min_limit_zero():
+def test_boss_alert_min_limit_zero(server):
     """Test 6: Verify boss alert level never goes below 0"""
     print("\n[Test 6] Testing boss alert minimum limit (0)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "5"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        # Boss alert should stay at 0 (boss_alertness=0)
-        # Wait for multiple cooldown periods
-        response_text = call_tool(process, "take_a_break", 600)
+        # Raise boss alert by one, then let more cooldown periods pass than
+        # it takes to reach 0 (use status check to avoid raising it again)
+        response_text = server.call_tool("take_a_break")
         boss_before = extract_boss_alert(response_text)
 
         print(f"    Boss alert before cooldowns: {boss_before}")
-        print("    Waiting 15 seconds...")
-        time.sleep(15)
+        print("    Advancing 15 simulated seconds...")
+        server.call_tool("advance_time", {"seconds": 15})
 
-        response_text = call_tool(process, "take_a_break", 601)
+        response_text = server.call_tool("check_stress_status")
         boss_after = extract_boss_alert(response_text)
 
         print(f"    Boss alert after cooldowns: {boss_after}")
@@ -448,44 +322,24 @@ def test_boss_alert_min_limit_zero():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_stress_max_limit_hundred():
+def test_stress_max_limit_hundred(server):
     """Test 7: Verify stress level never exceeds 100"""
     print("\n[Test 7] Testing stress maximum limit (100)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        # Check stress multiple times (no long wait needed)
-        # The max value check is about bounds, not accumulation
+        # Advance 20 simulated minutes before each check, so stress keeps
+        # accumulating (1+ per minute) until it runs into the limit
         stress_levels = []
         for i in range(10):
-            response_text = call_tool(process, "check_stress_status", 700 + i)
+            server.call_tool("advance_time", {"seconds": 1200})
+            response_text = server.call_tool("check_stress_status")
             stress = extract_stress_level(response_text)
             if stress is not None:
                 stress_levels.append(stress)
-            time.sleep(0.1)  # Small delay between checks
 
         if len(stress_levels) == 0:
             print("  ✗ Failed to get stress levels")
@@ -504,39 +358,18 @@ def test_stress_max_limit_hundred():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_stress_min_limit_zero():
+def test_stress_min_limit_zero(server):
     """Test 8: Verify stress level never goes below 0"""
     print("\n[Test 8] Testing stress minimum limit (0)...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Take many breaks to try to go negative
         stress_levels = []
-        for i in range(10):
-            response_text = call_tool(process, "take_a_break", 800 + i)
+        for response_text in take_breaks_until_cap(server, 10):
             stress = extract_stress_level(response_text)
             if stress is not None:
                 stress_levels.append(stress)
@@ -558,52 +391,28 @@ def test_stress_min_limit_zero():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_twenty_second_delay_at_boss_level_five():
+def test_twenty_second_delay_at_boss_level_five(process):
     """Test 9: Verify 20-second delay when boss alert level == 5"""
     print("\n[Test 9] Testing 20-second delay at boss level 5...")
     print("  PRE_MISSION.md:131-132 - 20s delay at level 5")
     print("  PRE_MISSION.md:315 - Test Scenario #4")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
-        # Raise boss alert to level 5
-        print("    Raising boss alert to level 5...")
-        boss_alert = 0
-        attempts = 0
-
-        while boss_alert < 5 and attempts < 20:
-            response_text = call_tool(process, "take_a_break", 900 + attempts)
-            boss_alert = extract_boss_alert(response_text)
-            attempts += 1
+        # Jump straight to boss alert level 5; raising it through breaks
+        # would itself pay one 20s delay on the break that reaches 5
+        print("    Setting boss alert to level 5...")
+        response_text = call_tool(process, "set_state", 900, {"boss_alert": 5})
+        boss_alert = extract_boss_alert(response_text)
 
         if boss_alert != 5:
-            print(f"  ✗ Could not raise boss alert to 5 (reached {boss_alert})")
+            print(f"  ✗ Could not set boss alert to 5 (got {boss_alert})")
             return False
 
-        print(f"    Boss alert is now 5 (after {attempts} attempts)")
+        print("    Boss alert is now 5")
 
         # Now measure the next call - should take ~20 seconds
         print("    Measuring response time for next call...")
@@ -628,39 +437,19 @@ def test_twenty_second_delay_at_boss_level_five():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_no_delay_when_boss_level_below_five():
+def test_no_delay_when_boss_level_below_five(server):
     """Test 10: Verify NO delay when boss alert level < 5"""
     print("\n[Test 10] Testing no delay when boss level < 5...")
     print("  PRE_MISSION.md:132 - Only delay at level 5")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "0", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Measure response time when boss alert is 0
         start_time = time.time()
-        response_text = call_tool(process, "take_a_break", 1000)
+        response_text = server.call_tool("take_a_break")
         end_time = time.time()
 
         elapsed = end_time - start_time
@@ -678,45 +467,25 @@ def test_no_delay_when_boss_level_below_five():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
 
 
-def test_state_persistence_across_calls():
+def test_state_persistence_across_calls(server):
     """Test 11: Verify state persists between tool calls"""
     print("\n[Test 11] Testing state persistence across calls...")
 
-    process = subprocess.Popen(
-        [PYTHON_PATH, MAIN_PATH, "--boss_alertness", "100", "--boss_alertness_cooldown", "300"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=0
-    )
-
-    time.sleep(1)
-
     try:
-        initialize_mcp_session(process)
-
         # Call 1 - get initial state
-        response1 = call_tool(process, "take_a_break", 1100)
+        response1 = server.call_tool("take_a_break")
         boss1 = extract_boss_alert(response1)
 
         # Call 2 - state should have changed
-        response2 = call_tool(process, "watch_netflix", 1101)
+        response2 = server.call_tool("watch_netflix")
         boss2 = extract_boss_alert(response2)
 
         # Call 3 - continue from previous state
-        response3 = call_tool(process, "bathroom_break", 1102)
+        response3 = server.call_tool("bathroom_break")
         boss3 = extract_boss_alert(response3)
 
         print(f"    Boss alert progression: {boss1} -> {boss2} -> {boss3}")
@@ -735,15 +504,22 @@ def test_state_persistence_across_calls():
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
-    finally:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+
+
+# Tests that run against a main.py subprocess rather than an in-process server
+STDIO_TESTS = {test_twenty_second_delay_at_boss_level_five}
+
+def run_with_server(args, test_func):
+    """Run a test against the shared in-process server for `args`"""
+    return test_func(shared_server(args))
+
+
+def run_with_subprocess(args, test_func):
+    """Run a test against a `main.py` subprocess of its own, over stdio"""
+    with mcp_server(*args, "--enable_time_travel", "--enable_set_state") as process:
+        return test_func(process)
 
 
 def main():
@@ -753,29 +529,43 @@ def main():
     print("=" * 70)
 
     tests = [
-        ("Stress auto-increment over time", test_stress_auto_increment_over_time),
-        ("Stress reduction on breaks", test_stress_reduction_on_break),
-        ("Boss alert increases on breaks", test_boss_alert_increases_on_break),
-        ("Boss alert cooldown auto-decrease", test_boss_alert_cooldown_auto_decrease),
-        ("Boss alert max limit (5)", test_boss_alert_max_limit_five),
-        ("Boss alert min limit (0)", test_boss_alert_min_limit_zero),
-        ("Stress max limit (100)", test_stress_max_limit_hundred),
-        ("Stress min limit (0)", test_stress_min_limit_zero),
-        ("20-second delay at boss level 5", test_twenty_second_delay_at_boss_level_five),
-        ("No delay when boss level < 5", test_no_delay_when_boss_level_below_five),
-        ("State persistence across calls", test_state_persistence_across_calls),
+        ("Stress auto-increment over time", QUIET_ARGS, test_stress_auto_increment_over_time),
+        ("Stress reduction on breaks", QUIET_ARGS, test_stress_reduction_on_break),
+        ("Boss alert increases on breaks", ALERT_ARGS, test_boss_alert_increases_on_break),
+        ("Boss alert cooldown auto-decrease", FAST_COOLDOWN_ARGS,
+         test_boss_alert_cooldown_auto_decrease),
+        ("Boss alert max limit (5)", BOUNDS_ARGS, test_boss_alert_max_limit_five),
+        ("Boss alert min limit (0)", BOUNDS_ARGS, test_boss_alert_min_limit_zero),
+        ("Stress max limit (100)", BOUNDS_ARGS, test_stress_max_limit_hundred),
+        ("Stress min limit (0)", BOUNDS_ARGS, test_stress_min_limit_zero),
+        ("20-second delay at boss level 5", ALERT_ARGS,
+         test_twenty_second_delay_at_boss_level_five),
+        ("No delay when boss level < 5", QUIET_ARGS, test_no_delay_when_boss_level_below_five),
+        ("State persistence across calls", ALERT_ARGS, test_state_persistence_across_calls),
     ]
 
-    results = []
-    for name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"\n✗ Test '{name}' failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((name, False))
+    # The 20-second delay test drives a real main.py over stdio, as a smoke
+    # test of the CLI and wire protocol, in a lane of its own. Tests on a
+    # shared in-process server must not overlap its state resets, so each
+    # flag set gets one lane that runs its tests back to back
+    lanes = {}
+    for name, args, test_func in tests:
+        if test_func in STDIO_TESTS:
+            lanes[name] = [(name, functools.partial(run_with_subprocess, args, test_func))]
+        else:
+            lanes.setdefault(args, []).append(
+                (name, functools.partial(run_with_server, args, test_func))
+            )
+
+    # Tests mostly wait on their servers, so lanes run concurrently and each
+    # test's output is replayed in order afterwards
+    try:
+        outcomes = run_lanes(list(lanes.values()))
+    finally:
+        stop_shared_servers()
+
+    sys.stdout.write("".join(outcomes[name][1] for name, _, _ in tests))
+    results = [(name, outcomes[name][0]) for name, _, _ in tests]
 
     print("\n" + "=" * 70)
     print("STATE MANAGEMENT TEST RESULTS")